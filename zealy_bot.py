@@ -4,57 +4,62 @@ Zealy Bot v2.0 - Fixed and Cleaned Version
 Monitor Zealy.io URLs for changes
 """
 
-import hashlib
 import asyncio
+import atexit
+import io
+import html
+import random
 import re
 import shutil
 import time
 import os
-import traceback
 import sys
+import tempfile
 import gc
-import json
+import logging
 import platform
 import threading
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from typing import Dict, Optional, Tuple, List, Set
 from queue import Queue, Empty
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
+from functools import lru_cache, partial
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 # Third-party imports
 try:
     import psutil
     from dotenv import load_dotenv
     import chromedriver_autoinstaller
+    import aiohttp
+    import xxhash
+    import orjson
+    from selectolax.lexbor import LexborHTMLParser
     from telegram import Update
+    from telegram.constants import ParseMode
     from telegram.ext import (
         Application,
-        CommandHandler,
         ContextTypes,
         ApplicationHandlerStop,
         MessageHandler,
         filters
     )
-    from telegram.error import TelegramError, NetworkError
+    from telegram.error import TelegramError, NetworkError, RetryAfter
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
     from selenium.common.exceptions import (
-        StaleElementReferenceException,
         WebDriverException,
-        TimeoutException,
-        NoSuchElementException
+        TimeoutException
     )
     from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 except ImportError as e:
     print(f"ERROR: Missing required package: {str(e)}")
     print("Please install required packages using:")
-    print("pip install python-telegram-bot selenium python-dotenv psutil chromedriver-autoinstaller")
+    print("pip install python-telegram-bot selenium python-dotenv psutil chromedriver-autoinstaller aiohttp selectolax xxhash orjson")
     sys.exit(1)
 
 # ============================================================================
@@ -63,6 +68,22 @@ except ImportError as e:
 
 IS_RENDER = os.getenv('IS_RENDER', 'false').lower() == 'true'
 
+# Log records are queued and written to stdout by a background thread,
+# so the event loop never blocks on console writes
+log_queue = Queue(-1)
+log_stream_handler = logging.StreamHandler(sys.stdout)
+log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = QueueListener(log_queue, log_stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# The queue side passes the bare message through, the stream formatter adds
+# the prefix; basicConfig's default format would apply it a second time
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[log_queue_handler])
+logger = logging.getLogger('zealy')
+
 print(f"🚀 Starting Zealy Bot v2.0 - FIXED VERSION")
 print(f"📍 Working directory: {os.getcwd()}")
 print(f"🐍 Python version: {sys.version}")
@@ -126,26 +147,50 @@ except ValueError:
 # CONFIGURATION CONSTANTS
 # ============================================================================
 
-# Chrome setup
-print("🔧 Setting up Chrome...")
-try:
-    if not IS_RENDER:
-        chromedriver_autoinstaller.install()
-        print("✅ ChromeDriver installed")
-except Exception as e:
-    print(f"⚠️ ChromeDriver auto-install warning: {e}")
-
 # Configuration for speed with reliability
 CHECK_INTERVAL = 30  # Check every 30 seconds
 MAX_URLS = 50  # Support up to 50 URLs
 ZEALY_CONTAINER_SELECTOR = "div.flex.flex-col.w-full.pt-100"
+ZEALY_ORIGIN = "https://zealy.io"  # Origin whose storage is wiped between pooled page loads
+ZEALY_URL_RE = re.compile(r'^https://(www\.)?zealy\.io/cw/[\w/-]+')  # Accepted by /add
 REQUEST_TIMEOUT = 30  # 30 second timeout
 MAX_RETRIES = 2  # 2 retries max
-RETRY_DELAY_BASE = 3  # 3 second base delay
+RETRY_DELAY_BASE = 3  # 3 second base delay, doubled per retry plus jitter
+MAX_RETRY_DELAY = 10  # Cap on a single retry delay
 FAILURE_THRESHOLD = 5  # Remove after 5 failures
-PAGE_LOAD_TIMEOUT = 60  # 60 seconds max page load
-ELEMENT_WAIT_TIMEOUT = 15  # 15 seconds element wait
-REACT_WAIT_TIME = 4  # 4 seconds for React
+MAX_URL_INTERVAL = 300  # Quiet URLs back off to at most 5 minutes between checks
+URL_INTERVAL_BACKOFF = 1.5  # Interval multiplier after each unchanged check
+NOTIFICATION_COOLDOWN = 60  # Min seconds between change alerts per URL
+PAGE_LOAD_TIMEOUT = 5  # DOMContentLoaded budget (eager load strategy)
+PAGE_TIMEOUT_LIMIT = 3  # Consecutive page load timeouts before each one counts as a failure
+SCRIPT_TIMEOUT = 3  # 3 seconds max for injected scripts (on top of the React wait)
+REACT_WAIT_TIME = 10  # Max seconds for React to render content
+CONTENT_SETTLE_TIME = 0.5  # Text must be unchanged this long before hashing
+TRACKING_PARAMS = frozenset({"ref", "fbclid", "gclid", "invitationid"})  # Dropped when normalizing URLs (plus utm_*)
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+BLOCKED_URL_PATTERNS = [  # Third-party trackers blocked in Chrome, none of them render quests
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*segment.io*",
+    "*sentry.io*",
+    "*intercom.io*",
+    "*hotjar.com*",
+]
+NETWORK_EVENT_BUFFER_BYTES = 64 * 1024  # DevTools network event buffer, enabled only for URL blocking
+
+# HTTP Fetch Configuration
+USE_HTTP_FETCH = True  # Try a plain HTTP GET before falling back to Selenium
+HTTP_LIMIT_PER_HOST = 8  # Max open connections per host
+HTTP_KEEPALIVE_TIMEOUT = 60  # Keep idle connections for 60 seconds
+HTTP_DNS_CACHE_TTL = 300  # Cache DNS lookups for 5 minutes
+HTTP_CHUNK_SIZE = 64 * 1024  # Read bodies in 64KB chunks
+MAX_BODY_BYTES = 5 * 1024 * 1024  # Abort static fetches larger than 5MB
+JS_FALLBACK_THRESHOLD = 3  # Consecutive HTTP misses before a URL moves to Selenium
+JS_RECHECK_EVERY = 20  # Every Nth fetch of a Selenium URL tries plain HTTP again
+
+# Worker Pools
+IO_WORKERS = 4  # Threads for driver quits and state writes
 
 # Performance Configuration
 MAX_PARALLEL_CHECKS = 5  # Check 5 URLs simultaneously
@@ -153,18 +198,66 @@ MAX_DRIVER_POOL_SIZE = 5  # Keep 5 drivers in pool
 DRIVER_REUSE_COUNT = 10  # Reuse each driver 10 times
 BATCH_SIZE = 10  # Process in batches of 10
 USE_DRIVER_POOL = True  # Enable driver pooling
+POOL_WARMUP_SIZE = 2  # Drivers pre-started at boot when restored URLs need Selenium
 USE_SEQUENTIAL_MODE = False  # Use parallel mode for speed
 
 # Memory Management Configuration
 MEMORY_LIMIT_MB = 1800  # Alert at 1.8GB
 MEMORY_WARNING_MB = 1500  # Warning at 1.5GB
 MEMORY_CRITICAL_MB = 1700  # Critical at 1.7GB
+MEMORY_PRESSURE_LOW_MB = 1000  # Cache TTL and pool size start shrinking above 1GB
 MEMORY_CHECK_INTERVAL = 30  # Check every 30 seconds
+MEMORY_SAMPLE_TTL = 1  # Reuse RSS sample for 1 second
+GC_FULL_COLLECT_PERCENT = 80  # Below this share of MEMORY_LIMIT_MB only the young generation is collected
+GC_THRESHOLDS = (5000, 10, 10)  # Fewer gen-0 passes during page load/parse allocation bursts
+CPU_SAMPLE_INTERVAL = 5  # Seconds between background CPU usage samples
+TASK_CANCEL_TIMEOUT = 5  # Seconds to wait for cancelled tasks on /stop
 STATE_FILE = "bot_state.json"
+STATE_SAVE_INTERVAL = 15  # Seconds between state_saver flushes of pending changes
+HASH_ALGORITHM = "xxh3_64+lexbor+innertext"  # Stored hashes are reset when hashing or text extraction changes
+
+# Telegram Configuration
+TELEGRAM_MESSAGE_LIMIT = 4000  # Telegram rejects messages over 4096 chars
+LIST_REPLY_CUTOFF = 3800  # /list stops adding entries past this many chars
+NOTIFICATION_QUEUE_SIZE = 200  # Oldest change alerts are dropped beyond this
+TELEGRAM_RATE_LIMIT = 25  # Max messages per TELEGRAM_RATE_PERIOD
+TELEGRAM_RATE_PERIOD = 1  # Seconds
+TELEGRAM_CHAT_INTERVAL = 1.05  # Min seconds between messages to one chat (~1/s cap)
+
+# HTTP/2 multiplexes Telegram requests over one connection (needs h2)
+try:
+    import h2  # noqa: F401
+    TELEGRAM_HTTP_VERSION = "2"
+except ImportError:
+    TELEGRAM_HTTP_VERSION = "1.1"
+
+# libuv event loop, roughly halves scheduling overhead (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Message templates (built once, filled per notification with format_map)
+BAR = sys.intern("━━━━━━━━━━━━━━━━━━")
+CHANGE_TEMPLATE = (
+    "🚨 <b>CHANGE DETECTED!</b>\n"
+    "📍 <b>URL:</b> {url}\n"
+    "⚡ <b>Response Time:</b> {response_time:.2f}s\n"
+    "📊 <b>Check #{check_count}</b>\n"
+    "🔄 <b>Total changes:</b> {total_changes}\n"
+    "🕐 <b>Time:</b> {now}\n"
+)
+REMOVED_TEMPLATE = (
+    f"🔴 <b>URL REMOVED</b>\n{BAR}\n"
+    "📍 <b>URL:</b> {url}\n"
+    "❌ <b>Reason:</b> Too many failures\n"
+    f"{BAR}"
+)
 
 # Cache Configuration
 CACHE_SIZE = 100  # LRU cache size
 CONTENT_CACHE_TTL = 60  # Cache for 60 seconds
+TEXT_HASH_CACHE_SIZE = 64  # Recent Selenium page texts whose cleaned hash is memoized
 
 # Chrome paths
 if IS_RENDER:
@@ -176,22 +269,57 @@ elif platform.system() == "Windows":
 else:
     CHROME_PATH = '/usr/bin/google-chrome'
     CHROMEDRIVER_PATH = shutil.which('chromedriver') or '/usr/bin/chromedriver'
+# Set by the Dockerfile; an explicit path wins over the platform default
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH") or CHROMEDRIVER_PATH
+
+# Chrome setup: the autoinstaller queries the network, only use it when no
+# chromedriver is installed
+print("🔧 Setting up Chrome...")
+installed_chromedriver = None
+try:
+    if not IS_RENDER and not os.path.exists(CHROMEDRIVER_PATH):
+        installed_chromedriver = chromedriver_autoinstaller.install()
+        print("✅ ChromeDriver installed")
+except Exception as e:
+    print(f"⚠️ ChromeDriver auto-install warning: {e}")
+
+# Resolved once; without a path Selenium 4.11 runs Selenium Manager (a
+# subprocess) every time a driver is created
+CHROMEDRIVER_BINARY = CHROMEDRIVER_PATH if os.path.exists(CHROMEDRIVER_PATH) else installed_chromedriver or None
 
 # ============================================================================
 # GLOBAL VARIABLES
 # ============================================================================
 
 # Driver pool
-driver_pool = []
+driver_pool: deque = deque()  # idle drivers, reused from the front
 driver_pool_lock = threading.Lock()
-driver_usage_count = {}
+
+# Long-lived driver reused across URLs in sequential mode
+sequential_driver = None
+sequential_driver_lock = threading.Lock()
+
+# Set by /stop so Selenium threads still finishing a check quit their driver
+# instead of pooling it, and don't start new ones
+drivers_stopping = threading.Event()
+# Selenium checks running on the executor, awaited by /stop before quitting drivers
+selenium_futures: Set[asyncio.Future] = set()
+
+# Shared HTTP session (created lazily inside the event loop)
+http_session: Optional['aiohttp.ClientSession'] = None
 
 # Content cache
-content_cache = {}
+content_cache: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()  # LRU order, oldest first
 cache_lock = threading.Lock()
 
-# Thread pool executor
-executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHECKS)
+# Memory sampling
+current_process = psutil.Process(os.getpid())
+memory_sample = (0.0, 0.0)  # (memory_mb, expires_at monotonic)
+cpu_sample = 0.0  # Process CPU % over the last CPU_SAMPLE_INTERVAL, kept by cpu_sampler()
+memory_pressure = 0.0  # 0 at MEMORY_PRESSURE_LOW_MB, 1 at MEMORY_LIMIT_MB
+
+# Thread pool for blocking I/O (driver quits, state file writes)
+executor = ThreadPoolExecutor(max_workers=IO_WORKERS)
 
 # Statistics tracking
 stats = {
@@ -200,23 +328,35 @@ stats = {
     'cache_hits': 0,
     'cache_misses': 0,
     'total_errors': 0,
+    'notifications_dropped': 0,
+    'page_load_timeouts': 0,
+    'not_modified': 0,
     'start_time': time.time()
 }
+stats_lock = threading.Lock()  # Counters are bumped from executor threads too
+# Uptime reference; stats['start_time'] is wall clock and restored from state
+process_start = time.monotonic()
 
 # Monitoring state
 monitored_urls: Dict[str, 'URLData'] = {}
-is_monitoring = False
-notification_queue = asyncio.Queue()
+# Insertion order of monitored_urls, so /remove can index without copying keys
+url_order: List[str] = []
+# Cached tuple(monitored_urls.items()) for read-only walks, None after adds/removes
+url_snapshot: Optional[Tuple[Tuple[str, 'URLData'], ...]] = None
+
+# State persistence
+state_dirty = False  # Set when persisted data changed since the last save
+state_save_lock = asyncio.Lock()  # Keeps snapshot-and-write in order across savers
 
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class URLData:
     hash: str
-    last_notified: float
-    last_checked: float
+    last_notified: float  # time.monotonic(), reset on restart
+    last_checked: float  # time.monotonic(), reset on restart
     failures: int
     consecutive_successes: int
     last_error: Optional[str] = None
@@ -224,6 +364,16 @@ class URLData:
     avg_response_time: float = 0.0
     total_changes: int = 0
     added_time: float = 0
+    short_name: str = ""
+    needs_js: bool = False  # Hash comes from Selenium instead of plain HTTP
+    etag: Optional[str] = None  # Validators from the last HTTP 200, for conditional GETs
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None  # Hash of the raw HTTP body behind `hash`
+    http_misses: int = 0  # Consecutive failed HTTP fetches while needs_js is False
+    js_checks_since_probe: int = 0  # Selenium fetches since HTTP was last retried, see JS_RECHECK_EVERY
+    interval: float = 0.0  # Adaptive per-URL check interval, 0 = CHECK_INTERVAL
+    next_check: float = 0.0  # time.monotonic(), reset on restart
+    page_timeouts: int = 0  # Consecutive page load timeouts, see PAGE_TIMEOUT_LIMIT
     
     def update_response_time(self, response_time: float):
         if self.avg_response_time == 0:
@@ -231,10 +381,218 @@ class URLData:
         else:
             self.avg_response_time = 0.7 * self.avg_response_time + 0.3 * response_time
 
+@dataclass
+class URLTotals:
+    """Running sums over monitored_urls so /status doesn't rescan every URL"""
+    checks: int = 0
+    changes: int = 0
+    response_time: float = 0.0
+    
+    def add(self, url_data: URLData, sign: int = 1):
+        self.checks += sign * url_data.check_count
+        self.changes += sign * url_data.total_changes
+        self.response_time += sign * url_data.avg_response_time
+    
+    def clear(self):
+        self.checks = self.changes = 0
+        self.response_time = 0.0
+
+url_totals = URLTotals()
+
+def track_url(url: str, url_data: URLData):
+    """Start monitoring a URL, keeping url_order, url_totals and the snapshot in sync"""
+    global url_snapshot
+    monitored_urls[url] = url_data
+    url_order.append(url)
+    url_totals.add(url_data)
+    url_snapshot = None
+
+def untrack_url(url: str, idx: Optional[int] = None) -> URLData:
+    """Stop monitoring a URL (idx: its position in url_order, if already known)"""
+    global url_snapshot
+    url_data = monitored_urls.pop(url)
+    if idx is None:
+        url_order.remove(url)
+    else:
+        del url_order[idx]
+    url_totals.add(url_data, -1)
+    url_snapshot = None
+    return url_data
+
+def get_url_snapshot() -> Tuple[Tuple[str, URLData], ...]:
+    """Monitored (url, data) pairs as a tuple, rebuilt only after adds/removes"""
+    global url_snapshot
+    if url_snapshot is None:
+        url_snapshot = tuple(monitored_urls.items())
+    return url_snapshot
+
+class DynamicGate:
+    """Concurrency limit that can be resized while tasks are waiting on it"""
+    
+    def __init__(self, limit: int):
+        self._limit = max(1, limit)
+        self._active = 0
+        self._cond = asyncio.Condition()
+    
+    @property
+    def limit(self) -> int:
+        return self._limit
+    
+    @property
+    def active(self) -> int:
+        return self._active
+    
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+    
+    async def release(self):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+    
+    async def resize(self, limit: int):
+        """Change the limit, waking waiters if it grew"""
+        async with self._cond:
+            self._limit = max(1, limit)
+            self._cond.notify_all()
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+# Bounds in-flight fetches, resized live by /speed
+fetch_gate = DynamicGate(MAX_PARALLEL_CHECKS)
+# Bounds live Chrome instances to what the pool keeps, HTTP checks aren't limited by it
+browser_gate = asyncio.Semaphore(MAX_DRIVER_POOL_SIZE)
+
+class TokenBucket:
+    """Async token bucket allowing `rate` acquisitions per `period` seconds"""
+    
+    def __init__(self, rate: int, period: float = 1.0):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+
+# Keeps outgoing notifications under Telegram's flood limits (global and per chat)
+telegram_limiter = TokenBucket(TELEGRAM_RATE_LIMIT, TELEGRAM_RATE_PERIOD)
+chat_limiter = TokenBucket(1, TELEGRAM_CHAT_INTERVAL)
+
+class NotificationQueue:
+    """Bounded FIFO of (message, priority, droppable) notifications
+    
+    When full, the oldest droppable entry makes room; must-deliver notices
+    keep their place and their senders wait for space instead.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: deque = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+    
+    def empty(self) -> bool:
+        return not self._items
+    
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+    
+    def _append(self, item: tuple):
+        self._items.append(item)
+        self._not_empty.set()
+        if self.full():
+            self._not_full.clear()
+    
+    def put_dropping(self, item: tuple) -> bool:
+        """Append a droppable item, evicting the oldest droppable one if full
+        
+        Returns False if something was dropped (the new item itself when
+        everything queued is must-deliver).
+        """
+        if not self.full():
+            self._append(item)
+            return True
+        for i, queued in enumerate(self._items):
+            if queued[2]:
+                del self._items[i]
+                self._append(item)
+                return False
+        return False
+    
+    def put_front(self, item: tuple):
+        """Return an item taken by the consumer to the head, even past maxsize"""
+        self._items.appendleft(item)
+        self._not_empty.set()
+        if self.full():
+            self._not_full.clear()
+    
+    async def put(self, item: tuple):
+        """Append an item, waiting for space if the queue is full"""
+        while self.full():
+            await self._not_full.wait()
+        self._append(item)
+    
+    def get_nowait(self) -> tuple:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+        if not self._items:
+            self._not_empty.clear()
+        self._not_full.set()
+        return item
+    
+    async def get(self) -> tuple:
+        while not self._items:
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+# Drained by notification_sender; change alerts are dropped oldest-first beyond the limit
+notification_queue = NotificationQueue(NOTIFICATION_QUEUE_SIZE)
+
+@dataclass
+class MonitorState:
+    """Monitoring lifecycle state; start/stop only mutate it while holding lock"""
+    running: bool = False
+    cycle: int = 0
+    last_cycle_ns: int = 0  # perf_counter_ns duration of the last completed cycle
+    tasks: Dict[str, asyncio.Task] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+# Shared with handlers through application.bot_data['monitor']
+monitor_state = MonitorState()
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+def count_stat(name: str, amount: int = 1):
+    """Increment a stats counter (thread-safe)"""
+    with stats_lock:
+        stats[name] += amount
+
+def retry_backoff(attempt: int) -> float:
+    """Delay before retry number `attempt` (1-based): exponential with jitter, capped"""
+    delay = RETRY_DELAY_BASE * 2 ** (attempt - 1) + random.uniform(0, RETRY_DELAY_BASE / 2)
+    return min(delay, MAX_RETRY_DELAY)
+
 def format_time_ago(timestamp):
     """Format timestamp as time ago string"""
     if timestamp == 0:
@@ -250,58 +608,203 @@ def format_time_ago(timestamp):
     else:
         return f"{seconds // 86400}d ago"
 
-def get_memory_usage():
-    """Get current memory usage in MB"""
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL so variants of the same page dedupe to one key"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), query, ""))
+
+def get_short_name(url: str) -> str:
+    """Get display name of a Zealy URL (path after /cw/)"""
+    return url.split("/cw/", 1)[-1]
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Split text into chunks under the Telegram limit, preferring line breaks"""
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text:
+        chunks.append(text)
+    return chunks
+
+def get_memory_usage(max_age: float = MEMORY_SAMPLE_TTL):
+    """Get current memory usage in MB, reusing a sample up to max_age seconds old"""
+    global memory_sample
+    now = time.monotonic()
+    memory_mb, expires_at = memory_sample
+    if now < expires_at:
+        return memory_mb
+    
     try:
-        process = psutil.Process(os.getpid())
-        memory_mb = process.memory_info().rss / 1024 / 1024
+        memory_mb = current_process.memory_info().rss / 1024 / 1024
+        memory_sample = (memory_mb, now + max_age)
         return memory_mb
     except Exception as e:
         print(f"⚠️ Error getting memory usage: {e}")
         return 0
 
+def get_browser_memory_mb() -> float:
+    """Combined RSS of our chromedriver/Chrome child processes in MB (blocking)"""
+    total = 0
+    for child in current_process.children(recursive=True):
+        try:
+            if 'chrom' in child.name().lower():
+                total += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return total / 1024 / 1024
+
+def update_memory_pressure(memory_mb: float):
+    """Map memory usage onto 0..1 between MEMORY_PRESSURE_LOW_MB and MEMORY_LIMIT_MB"""
+    global memory_pressure
+    span = MEMORY_LIMIT_MB - MEMORY_PRESSURE_LOW_MB
+    memory_pressure = min(1.0, max(0.0, (memory_mb - MEMORY_PRESSURE_LOW_MB) / span))
+
+def effective_cache_ttl() -> float:
+    """Content cache TTL, shortened as memory pressure rises"""
+    return CONTENT_CACHE_TTL * (1 - memory_pressure)
+
+def effective_pool_size() -> int:
+    """Idle drivers worth keeping at the current memory pressure"""
+    return max(1, int(MAX_DRIVER_POOL_SIZE * (1 - memory_pressure)))
+
+def build_bot_state() -> dict:
+    """Snapshot current bot state into plain dicts"""
+    state = {
+        "monitored_urls": {},
+        "is_monitoring": monitor_state.running,
+        "timestamp": time.time(),
+        "auto_restart": monitor_state.running,
+        "hash_algorithm": HASH_ALGORITHM,
+        "stats": dict(stats),
+        # /mode and /speed choices, so they survive a restart
+        "settings": {
+            "sequential_mode": USE_SEQUENTIAL_MODE,
+            "check_interval": CHECK_INTERVAL,
+            "max_parallel_checks": MAX_PARALLEL_CHECKS,
+            "react_wait_time": REACT_WAIT_TIME
+        }
+    }
+    
+    for url, url_data in monitored_urls.items():
+        # Flat slots dataclass, a direct attribute read beats asdict's deep copy
+        state["monitored_urls"][url] = {name: getattr(url_data, name) for name in URLData.__slots__}
+    
+    return state
+
+def write_state_file(state: dict):
+    """Write state atomically so a crash mid-write never truncates it"""
+    # Unique temp file, a fixed name lets two writers replace each other's file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(STATE_FILE)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, STATE_FILE)
+    except:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def mark_state_dirty():
+    """Flag state as changed so state_saver() writes it on its next tick"""
+    global state_dirty
+    state_dirty = True
+
+def mark_state_saved():
+    """Record that the current state has been snapshotted for saving"""
+    global state_dirty
+    state_dirty = False
+
 def save_bot_state():
-    """Save current bot state to file"""
+    """Save current bot state to file (blocking, for use outside the event loop)"""
     try:
-        state = {
-            "monitored_urls": {},
-            "is_monitoring": is_monitoring,
-            "timestamp": time.time(),
-            "auto_restart": is_monitoring,
-            "stats": stats
-        }
-        
-        for url, url_data in monitored_urls.items():
-            state["monitored_urls"][url] = asdict(url_data)
-        
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
+        write_state_file(build_bot_state())
+        mark_state_saved()
         print(f"💾 State saved - {len(monitored_urls)} URLs")
         return True
     except Exception as e:
         print(f"❌ Error saving state: {e}")
         return False
 
+async def save_bot_state_async():
+    """Save current bot state, writing the file on the executor"""
+    # Held across snapshot and write, so an older snapshot can't land last
+    async with state_save_lock:
+        try:
+            # Snapshot on the loop thread so handlers can't mutate it mid-write;
+            # changes made while the file is written mark it dirty again
+            state = build_bot_state()
+            mark_state_saved()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(executor, write_state_file, state)
+            print(f"💾 State saved - {len(state['monitored_urls'])} URLs")
+            return True
+        except Exception as e:
+            mark_state_dirty()
+            print(f"❌ Error saving state: {e}")
+            return False
+
 def load_bot_state():
     """Load bot state from file"""
-    global monitored_urls, is_monitoring, stats
+    global monitored_urls, stats, url_snapshot
+    global USE_SEQUENTIAL_MODE, CHECK_INTERVAL, MAX_PARALLEL_CHECKS, REACT_WAIT_TIME
     try:
         if not os.path.exists(STATE_FILE):
             print("📁 No previous state found")
             return False
         
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
+        with open(STATE_FILE, 'rb') as f:
+            state = orjson.loads(f.read())
+        
+        # Hashes from another algorithm can't be compared, re-baseline instead
+        rehash = state.get("hash_algorithm", "sha256") != HASH_ALGORITHM
+        if rehash:
+            print(f"🔁 Hashing changed to {HASH_ALGORITHM}, re-baselining URLs")
         
         monitored_urls.clear()
+        url_order.clear()
+        url_totals.clear()
+        url_snapshot = None
         for url, url_data_dict in state.get("monitored_urls", {}).items():
-            monitored_urls[url] = URLData(**url_data_dict)
+            # Older state may hold several variants of one page, keep the first
+            url = normalize_url(url)
+            if url in monitored_urls:
+                continue
+            url_data = URLData(**url_data_dict)
+            if rehash:
+                url_data.hash = ""
+            # Monotonic timestamps are meaningless across restarts
+            url_data.last_notified = 0
+            url_data.last_checked = 0
+            url_data.next_check = 0
+            if not url_data.short_name:
+                url_data.short_name = get_short_name(url)
+            track_url(url, url_data)
         
         if 'stats' in state:
             stats.update(state['stats'])
         
+        # Older state files have no settings, keep the defaults then
+        settings = state.get("settings", {})
+        USE_SEQUENTIAL_MODE = settings.get("sequential_mode", USE_SEQUENTIAL_MODE)
+        CHECK_INTERVAL = settings.get("check_interval", CHECK_INTERVAL)
+        MAX_PARALLEL_CHECKS = settings.get("max_parallel_checks", MAX_PARALLEL_CHECKS)
+        REACT_WAIT_TIME = settings.get("react_wait_time", REACT_WAIT_TIME)
+        
         should_auto_restart = state.get("auto_restart", False)
-        is_monitoring = False
+        monitor_state.running = False
         
         print(f"📁 Restored {len(monitored_urls)} URLs")
         return should_auto_restart
@@ -309,16 +812,22 @@ def load_bot_state():
         print(f"❌ Error loading state: {e}")
         return False
 
+def collect_garbage(memory_mb: float) -> int:
+    """Collect garbage, sweeping every generation only when memory is high"""
+    generation = 2 if memory_mb > MEMORY_LIMIT_MB * GC_FULL_COLLECT_PERCENT / 100 else 0
+    return gc.collect(generation)
+
 def cleanup_memory():
     """Force garbage collection and cleanup"""
     try:
-        collected = gc.collect()
+        memory_mb = get_memory_usage()
+        collected = collect_garbage(memory_mb)
         print(f"🗑️ Garbage collected: {collected} objects")
         
-        memory_mb = get_memory_usage()
         if memory_mb > MEMORY_WARNING_MB:
             with cache_lock:
                 content_cache.clear()
+            hash_page_text.cache_clear()
             print("🧹 Cleared content cache")
         
         # Kill hanging Chrome processes
@@ -333,15 +842,55 @@ def cleanup_memory():
         except Exception as e:
             print(f"⚠️ Error cleaning Chrome processes: {e}")
         
-        return get_memory_usage()
+        return get_memory_usage(max_age=0)
     except Exception as e:
         print(f"❌ Error during cleanup: {e}")
-        return get_memory_usage()
+        return get_memory_usage(max_age=0)
 
 # ============================================================================
 # CHROME DRIVER FUNCTIONS
 # ============================================================================
 
+PAGE_TIMEOUT_ERROR = "Page load timed out"
+
+# The Zealy container is polled alone; the rest are tried in order, once, only
+# if it never shows up. First element with more than 10 chars of text wins
+CONTENT_SELECTORS = [
+    ZEALY_CONTAINER_SELECTOR,
+    "div[class*='flex'][class*='flex-col']",
+    "main",
+    "body"
+]
+
+# Polls the container in the page until its text settles or the timeout
+# passes, so the whole wait costs a single WebDriver round trip. Fallbacks
+# aren't polled, the app shell would match them before React renders
+CONTENT_PROBE_JS = """
+const [selectors, timeoutMs, settleMs, done] = arguments;
+const [container, ...fallbacks] = selectors;
+const textOf = (selector) => {
+    const el = document.querySelector(selector);
+    return el && el.innerText.trim().length > 10 ? el.innerText : null;
+};
+const start = Date.now();
+let last = null, lastChange = start;
+(function poll() {
+    const text = textOf(container);
+    const now = Date.now();
+    if (text !== last) { last = text; lastChange = now; }
+    if (text !== null && now - lastChange >= settleMs) return done(text);
+    if (now - start >= timeoutMs) {
+        if (text !== null) return done(text);
+        for (const selector of fallbacks) {
+            const fallback = textOf(selector);
+            if (fallback !== null) return done(fallback);
+        }
+        return done(null);
+    }
+    setTimeout(poll, 100);
+})();
+"""
+
 def get_chrome_options():
     """Get optimized Chrome options"""
     options = Options()
@@ -350,7 +899,7 @@ def get_chrome_options():
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
-    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    options.add_argument(f"--user-agent={USER_AGENT}")
     
     # Disable non-essential features (keep JavaScript enabled!)
     options.add_argument("--disable-extensions")
@@ -366,7 +915,12 @@ def get_chrome_options():
     options.add_argument("--disable-renderer-backgrounding")
     options.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees")
     
-    options.page_load_strategy = 'normal'
+    # Images never reach the hashed text; stylesheets stay, innerText depends on them
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    
+    # Return at DOMContentLoaded, the content probe waits for React
+    options.page_load_strategy = 'eager'
     
     if IS_RENDER:
         options.add_argument("--disable-setuid-sandbox")
@@ -386,14 +940,25 @@ def create_driver():
     try:
         options = get_chrome_options()
         
-        if IS_RENDER or not os.path.exists(CHROMEDRIVER_PATH):
-            driver = webdriver.Chrome(options=options)
-        else:
-            service = Service(executable_path=CHROMEDRIVER_PATH)
+        if CHROMEDRIVER_BINARY:
+            service = Service(executable_path=CHROMEDRIVER_BINARY)
             driver = webdriver.Chrome(service=service, options=options)
+        else:
+            driver = webdriver.Chrome(options=options)
         
         driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
-        driver.implicitly_wait(10)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+        
+        # Block trackers for the driver's lifetime, not per page load. The domain
+        # has to be enabled for the block list to apply; keep its event buffer
+        # small since nothing reads the events
+        try:
+            driver.execute_cdp_cmd("Network.enable", {"maxTotalBufferSize": NETWORK_EVENT_BUFFER_BYTES})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logger.debug("URL blocking unavailable, loading trackers: %s", e)
+        
+        driver.zealy_uses = 0  # Page loads served, checked against DRIVER_REUSE_COUNT
         
         return driver
     except Exception as e:
@@ -402,72 +967,106 @@ def create_driver():
 
 def get_driver_from_pool():
     """Get a driver from pool or create new"""
-    global driver_pool, driver_usage_count
-    
+    if drivers_stopping.is_set():
+        return None, False
     if not USE_DRIVER_POOL:
         return create_driver(), False
     
-    with driver_pool_lock:
-        while driver_pool:
-            driver = driver_pool.pop(0)
-            driver_id = id(driver)
-            
+    while True:
+        # Only the pop happens under the lock, health checks and quits don't
+        with driver_pool_lock:
+            if not driver_pool:
+                break
+            driver = driver_pool.popleft()
+        
+        usage = getattr(driver, 'zealy_uses', 0)
+        if usage < DRIVER_REUSE_COUNT:
             try:
-                usage = driver_usage_count.get(driver_id, 0)
-                if usage < DRIVER_REUSE_COUNT:
-                    driver.execute_script("return 1")
-                    driver_usage_count[driver_id] = usage + 1
-                    return driver, True
-                else:
-                    driver.quit()
-                    del driver_usage_count[driver_id]
+                driver.execute_script("return 1")
+                driver.zealy_uses = usage + 1
+                return driver, True
             except:
-                try:
-                    driver.quit()
-                except:
-                    pass
-                if driver_id in driver_usage_count:
-                    del driver_usage_count[driver_id]
-        
-        driver = create_driver()
-        if driver:
-            driver_usage_count[id(driver)] = 1
-        return driver, False
+                pass
+        safe_quit(driver)
+    
+    driver = create_driver()
+    if driver:
+        driver.zealy_uses = 1
+    return driver, False
+
+def clear_driver_storage(driver):
+    """Clear Zealy cookies, local and session storage, IndexedDB and caches"""
+    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+        'origin': ZEALY_ORIGIN,
+        'storageTypes': 'all'
+    })
+    # clearDataForOrigin skips sessionStorage, which survives same-tab navigations
+    driver.execute_script("window.sessionStorage.clear()")
 
 def return_driver_to_pool(driver):
     """Return driver to pool for reuse"""
-    if not USE_DRIVER_POOL or not driver:
+    if not USE_DRIVER_POOL or not driver or drivers_stopping.is_set():
         if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            safe_quit(driver)
         return
     
-    with driver_pool_lock:
-        driver_id = id(driver)
-        usage = driver_usage_count.get(driver_id, 0)
+    if getattr(driver, 'zealy_uses', 0) < DRIVER_REUSE_COUNT:
+        try:
+            clear_driver_storage(driver)
+        except:
+            safe_quit(driver)
+            return
         
-        if usage < DRIVER_REUSE_COUNT and len(driver_pool) < MAX_DRIVER_POOL_SIZE:
-            try:
-                driver.delete_all_cookies()
-                driver.execute_script("window.localStorage.clear();")
-                driver.execute_script("window.sessionStorage.clear();")
+        with driver_pool_lock:
+            if len(driver_pool) < effective_pool_size():
                 driver_pool.append(driver)
-            except:
-                try:
-                    driver.quit()
-                except:
-                    pass
-                if driver_id in driver_usage_count:
-                    del driver_usage_count[driver_id]
-        else:
-            try:
-                driver.quit()
-            except:
-                pass
-            if driver_id in driver_usage_count:
-                del driver_usage_count[driver_id]
+                return
+    
+    safe_quit(driver)
+
+def warm_driver_pool(count: int):
+    """Pre-start pooled drivers so the first checks skip Chrome startup (blocking)"""
+    count = min(count, effective_pool_size())
+    with ThreadPoolExecutor(max_workers=count) as starter:
+        drivers = list(starter.map(lambda _: create_driver(), range(count)))
+    for driver in drivers:
+        return_driver_to_pool(driver)
+    print(f"🔥 Driver pool warmed: {len(driver_pool)} ready")
+
+def drain_driver_pool():
+    """Empty the driver pool and return the drivers it held"""
+    with driver_pool_lock:
+        drivers = list(driver_pool)
+        driver_pool.clear()
+    return drivers
+
+def safe_quit(driver):
+    """Quit a driver, ignoring errors (blocking)"""
+    try:
+        driver.quit()
+    except:
+        pass
+
+def get_sequential_driver():
+    """Get the long-lived sequential-mode driver, creating it on first use"""
+    global sequential_driver
+    with sequential_driver_lock:
+        if sequential_driver is None and not drivers_stopping.is_set():
+            sequential_driver = create_driver()
+        return sequential_driver
+
+def reset_sequential_driver():
+    """Quit the sequential-mode driver so the next call rebuilds it"""
+    global sequential_driver
+    with sequential_driver_lock:
+        driver, sequential_driver = sequential_driver, None
+    if driver:
+        safe_quit(driver)
+
+async def quit_drivers(drivers):
+    """Quit drivers in parallel on the executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, safe_quit, driver) for driver in drivers))
 
 # ============================================================================
 # CONTENT PROCESSING FUNCTIONS
@@ -475,60 +1074,101 @@ def return_driver_to_pool(driver):
 
 def get_cached_content(url: str) -> Optional[Tuple[str, float]]:
     """Get cached content if available"""
+    hit = None
     with cache_lock:
         if url in content_cache:
             hash_val, timestamp = content_cache[url]
-            if time.time() - timestamp < CONTENT_CACHE_TTL:
-                stats['cache_hits'] += 1
-                return hash_val, timestamp
-        stats['cache_misses'] += 1
-        return None
+            if time.monotonic() - timestamp < effective_cache_ttl():
+                content_cache.move_to_end(url)
+                hit = (hash_val, timestamp)
+    
+    # Counted after releasing cache_lock to keep the critical section short
+    count_stat('cache_hits' if hit else 'cache_misses')
+    return hit
 
 def set_cached_content(url: str, hash_val: str):
     """Cache content hash"""
     with cache_lock:
-        content_cache[url] = (hash_val, time.time())
+        content_cache[url] = (hash_val, time.monotonic())
+        content_cache.move_to_end(url)
         
-        if len(content_cache) > CACHE_SIZE:
-            sorted_items = sorted(content_cache.items(), key=lambda x: x[1][1])
-            for old_url, _ in sorted_items[:len(content_cache) - CACHE_SIZE]:
-                del content_cache[old_url]
+        # Evict least recently used entries, O(1) each
+        while len(content_cache) > CACHE_SIZE:
+            content_cache.popitem(last=False)
+
+# Dynamic fragments stripped before hashing, compiled once and applied in order
+DYNAMIC_CONTENT_PATTERNS = (
+    re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z'),  # Timestamps
+    re.compile(r'\d+\s*XP'),  # XP values
+    re.compile(r'\b[A-F0-9]{8}-(?:[A-F0-9]{4}-){3}[A-F0-9]{12}\b', re.IGNORECASE),  # UUIDs
+    re.compile(r'\d+\s*(hours?|minutes?|seconds?|days?|weeks?|months?)\s*ago', re.IGNORECASE),  # Relative time
+    re.compile(r'\d{1,2}:\d{2}\s*(AM|PM|am|pm)?'),  # Time displays
+    re.compile(r'\d+\s*members?', re.IGNORECASE),  # Member counts
+    re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}'),  # Dates
+    re.compile(r'\d{1,2}-\d{1,2}-\d{2,4}'),
+    re.compile(r'\b\d{4,}\b'),  # Long numbers (likely IDs)
+)
+WHITESPACE_RE = re.compile(r'\s+')
 
 def clean_zealy_content(content: str) -> str:
     """Clean Zealy content to remove dynamic elements"""
-    # Remove timestamps
-    clean_content = re.sub(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z', '', content)
-    
-    # Remove XP values
-    clean_content = re.sub(r'\d+\s*XP', '', clean_content)
-    
-    # Remove UUIDs
-    clean_content = re.sub(r'\b[A-F0-9]{8}-(?:[A-F0-9]{4}-){3}[A-F0-9]{12}\b', '', clean_content, flags=re.IGNORECASE)
-    
-    # Remove relative time
-    clean_content = re.sub(r'\d+\s*(hours?|minutes?|seconds?|days?|weeks?|months?)\s*ago', '', clean_content, flags=re.IGNORECASE)
-    
-    # Remove time displays
-    clean_content = re.sub(r'\d{1,2}:\d{2}\s*(AM|PM|am|pm)?', '', clean_content)
-    
-    # Remove member counts
-    clean_content = re.sub(r'\d+\s*members?', '', clean_content, flags=re.IGNORECASE)
-    
-    # Remove dates
-    clean_content = re.sub(r'\d{1,2}/\d{1,2}/\d{2,4}', '', clean_content)
-    clean_content = re.sub(r'\d{1,2}-\d{1,2}-\d{2,4}', '', clean_content)
-    
-    # Remove long numbers (likely IDs)
-    clean_content = re.sub(r'\b\d{4,}\b', '', clean_content)
+    clean_content = content
+    for pattern in DYNAMIC_CONTENT_PATTERNS:
+        clean_content = pattern.sub('', clean_content)
     
     # Remove extra whitespace
-    clean_content = re.sub(r'\s+', ' ', clean_content)
+    clean_content = WHITESPACE_RE.sub(' ', clean_content)
     
     return clean_content.strip()
 
-def get_content_hash_optimized(url: str, use_cache: bool = True, debug_mode: bool = False) -> Tuple[Optional[str], float, Optional[str], Optional[str]]:
-    """Get content hash with retry logic and content cleaning"""
-    start_time = time.time()
+def hash_content(clean_content: str) -> str:
+    """Hash cleaned page content (non-cryptographic, change detection only)"""
+    # xxhash reads str as UTF-8 directly; for ASCII text that's the string's own buffer
+    return xxhash.xxh3_64_hexdigest(clean_content)
+
+@lru_cache(maxsize=TEXT_HASH_CACHE_SIZE)
+def hash_page_text(content: str) -> str:
+    """Clean and hash page text, memoized so unchanged pages skip the regex passes"""
+    return hash_content(clean_zealy_content(content))
+
+def extract_page_text(html: str) -> Optional[str]:
+    """Extract the quest container's text from static HTML, None if it isn't server-rendered"""
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(['script', 'style', 'noscript'])
+    
+    # Only the container counts: main/body of an unrendered page is app-shell
+    # text, and a miss here is what sends the URL to Selenium
+    element = tree.css_first(ZEALY_CONTAINER_SELECTOR)
+    if element:
+        content = element.text(separator=" ", strip=True)
+        if len(content) > 10:
+            return content
+    return None
+
+def parse_and_hash(html: str, debug_mode: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """Extract, clean and hash static HTML (blocking, runs on the executor)
+    
+    Returns (hash, content_sample), so the parsed tree and page text are
+    freed before the result reaches the event loop.
+    """
+    content = extract_page_text(html)
+    if not content:
+        return None, None
+    
+    clean_content = clean_zealy_content(content)
+    if not debug_mode:
+        # Uncached, unchanged bodies are already caught by body_hash before parsing
+        return hash_content(clean_content), None
+    
+    content_sample = f"RAW:\n{content[:250]}\n\nCLEANED:\n{clean_content[:250]}"
+    return hash_content(clean_content), content_sample
+
+def get_content_hash_optimized(url: str, use_cache: bool = True, debug_mode: bool = False, sequential: bool = False) -> Tuple[Optional[str], float, Optional[str], Optional[str]]:
+    """Get content hash with retry logic and content cleaning
+    
+    In sequential mode one long-lived driver is reused instead of the pool.
+    """
+    start_time = time.monotonic()
     
     if use_cache and not debug_mode:
         cached = get_cached_content(url)
@@ -545,69 +1185,65 @@ def get_content_hash_optimized(url: str, use_cache: bool = True, debug_mode: boo
         
         try:
             print(f"🌐 Loading URL: {url} (Attempt {retry_count + 1}/{max_retries})")
-            driver, from_pool = get_driver_from_pool()
+            if sequential:
+                driver, from_pool = get_sequential_driver(), True
+            else:
+                driver, from_pool = get_driver_from_pool()
             if not driver:
-                return None, time.time() - start_time, "Failed to create driver", None
+                return None, time.monotonic() - start_time, "Failed to create driver", None
             
             print(f"🔄 Navigating to URL...")
-            driver.get(url)
-            
-            # Wait for React to load
-            print(f"⏳ Waiting {REACT_WAIT_TIME}s for React to load...")
-            time.sleep(REACT_WAIT_TIME)
-            
-            print("🔍 Looking for page elements...")
-            content = None
-            strategies = [
-                (By.CSS_SELECTOR, ZEALY_CONTAINER_SELECTOR, ELEMENT_WAIT_TIMEOUT),
-                (By.CSS_SELECTOR, "div[class*='flex'][class*='flex-col']", 15),
-                (By.CSS_SELECTOR, "main", 10),
-                (By.TAG_NAME, "body", 5)
-            ]
+            try:
+                driver.get(url)
+            except TimeoutException:
+                # A stuck load shouldn't hold the driver, skip this round instead.
+                # The navigation may still be running, so quit rather than reuse it
+                count_stat('page_load_timeouts')
+                print(f"⚠️ Page load exceeded {PAGE_LOAD_TIMEOUT}s on {url}")
+                if sequential:
+                    reset_sequential_driver()
+                else:
+                    safe_quit(driver)
+                driver = None
+                return None, time.monotonic() - start_time, PAGE_TIMEOUT_ERROR, None
             
-            for by, selector, wait_time in strategies:
-                try:
-                    print(f"   Trying selector: {selector} (wait: {wait_time}s)")
-                    element = WebDriverWait(driver, wait_time).until(
-                        EC.presence_of_element_located((by, selector))
-                    )
-                    
-                    # Wait for content to stabilize
-                    time.sleep(2)
-                    
-                    content = element.text
-                    if content and len(content.strip()) > 10:
-                        print(f"   ✅ Found content with selector: {selector} ({len(content)} chars)")
-                        break
-                except TimeoutException:
-                    print(f"   ⚠️ Selector {selector} not found after {wait_time}s")
-                    continue
+            # One in-page polling loop, no element lookups through WebDriver
+            print(f"🔍 Waiting up to {REACT_WAIT_TIME}s for React content...")
+            driver.set_script_timeout(REACT_WAIT_TIME + SCRIPT_TIMEOUT)
+            content = driver.execute_async_script(
+                CONTENT_PROBE_JS,
+                CONTENT_SELECTORS,
+                int(REACT_WAIT_TIME * 1000),
+                int(CONTENT_SETTLE_TIME * 1000)
+            )
+            if content:
+                print(f"   ✅ Found content ({len(content)} chars)")
             
             if not content or len(content.strip()) < 10:
                 print(f"⚠️ Content too short: {len(content) if content else 0} chars")
                 if retry_count < max_retries - 1:
                     retry_count += 1
-                    time.sleep(RETRY_DELAY_BASE)
+                    time.sleep(retry_backoff(retry_count))
                     continue
-                return None, time.time() - start_time, "No content found", None
+                return None, time.monotonic() - start_time, "No content found", None
             
             print(f"📄 Raw content length: {len(content)} chars")
             
-            # Clean content
-            clean_content = clean_zealy_content(content)
-            print(f"📄 Cleaned content length: {len(clean_content)} chars")
-            
-            # Generate hash
-            content_hash = hashlib.sha256(clean_content.encode()).hexdigest()
-            response_time = time.time() - start_time
-            
-            # Return sample for debugging
-            content_sample = f"RAW:\n{content[:250]}\n\nCLEANED:\n{clean_content[:250]}" if debug_mode else None
+            # Clean and hash; unchanged text (the common case) is a cache hit
+            if debug_mode:
+                clean_content = clean_zealy_content(content)
+                print(f"📄 Cleaned content length: {len(clean_content)} chars")
+                content_hash = hash_content(clean_content)
+                content_sample = f"RAW:\n{content[:250]}\n\nCLEANED:\n{clean_content[:250]}"
+            else:
+                content_hash = hash_page_text(content)
+                content_sample = None
+            response_time = time.monotonic() - start_time
             
             if use_cache and not debug_mode:
                 set_cached_content(url, content_hash)
             
-            stats['total_checks'] += 1
+            count_stat('total_checks')
             
             print(f"🔢 Hash generated: {content_hash[:16]}... in {response_time:.2f}s")
             return content_hash, response_time, None, content_sample
@@ -616,38 +1252,200 @@ def get_content_hash_optimized(url: str, use_cache: bool = True, debug_mode: boo
             print(f"⚠️ Timeout waiting for page on {url}")
             if retry_count < max_retries - 1:
                 retry_count += 1
-                time.sleep(RETRY_DELAY_BASE)
+                time.sleep(retry_backoff(retry_count))
                 continue
-            stats['total_errors'] += 1
-            return None, time.time() - start_time, "Timeout waiting for page", None
+            count_stat('total_errors')
+            return None, time.monotonic() - start_time, "Timeout waiting for page", None
         except WebDriverException as e:
             print(f"⚠️ WebDriver error: {str(e)}")
+            # Session is likely dead, retry on a fresh driver instead of this one
+            if sequential:
+                reset_sequential_driver()
+            else:
+                safe_quit(driver)
+            driver = None
             if retry_count < max_retries - 1:
                 retry_count += 1
-                time.sleep(RETRY_DELAY_BASE)
+                time.sleep(retry_backoff(retry_count))
                 continue
-            stats['total_errors'] += 1
-            return None, time.time() - start_time, f"WebDriver error: {str(e)}", None
+            count_stat('total_errors')
+            return None, time.monotonic() - start_time, f"WebDriver error: {str(e)}", None
         except Exception as e:
             print(f"❌ Error: {str(e)}")
             if retry_count < max_retries - 1:
                 retry_count += 1
-                time.sleep(RETRY_DELAY_BASE)
+                time.sleep(retry_backoff(retry_count))
                 continue
-            stats['total_errors'] += 1
-            return None, time.time() - start_time, str(e), None
+            count_stat('total_errors')
+            return None, time.monotonic() - start_time, str(e), None
         finally:
             if driver:
-                return_driver_to_pool(driver)
-                gc.collect()
+                if sequential:
+                    try:
+                        clear_driver_storage(driver)
+                    except:
+                        pass
+                else:
+                    return_driver_to_pool(driver)
+    
+    return None, time.monotonic() - start_time, "Max retries reached", None
+
+# ============================================================================
+# HTTP FETCH FUNCTIONS
+# ============================================================================
+
+def get_http_session() -> 'aiohttp.ClientSession':
+    """Get the shared keep-alive HTTP session, creating it on first use"""
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=MAX_PARALLEL_CHECKS,
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+        )
+        http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            headers={'User-Agent': USER_AGENT}
+        )
+    return http_session
+
+async def close_http_session():
+    """Close the shared HTTP session"""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
+async def get_content_hash_http(url: str, debug_mode: bool = False, url_data: Optional[URLData] = None) -> Tuple[Optional[str], float, Optional[str], Optional[str]]:
+    """Get content hash from the static HTML (no JavaScript rendering)
+    
+    With url_data, sends a conditional GET and reuses its hash on 304
+    or when the raw body is byte-identical to the last one.
+    """
+    start_time = time.monotonic()
+    
+    headers = {}
+    if url_data and url_data.hash and not debug_mode:
+        if url_data.etag:
+            headers['If-None-Match'] = url_data.etag
+        if url_data.last_modified:
+            headers['If-Modified-Since'] = url_data.last_modified
     
-    return None, time.time() - start_time, "Max retries reached", None
+    try:
+        session = get_http_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and headers:
+                count_stat('total_checks')
+                count_stat('not_modified')
+                response_time = time.monotonic() - start_time
+                print(f"📭 Not modified (304) in {response_time:.2f}s")
+                return url_data.hash, response_time, None, None
+            
+            if response.status != 200:
+                return None, time.monotonic() - start_time, f"HTTP {response.status}", None
+            
+            # Stream with a cap so one huge page can't blow up RSS
+            if (response.content_length or 0) > MAX_BODY_BYTES:
+                return None, time.monotonic() - start_time, "Page too large", None
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(HTTP_CHUNK_SIZE):
+                body += chunk
+                if len(body) > MAX_BODY_BYTES:
+                    return None, time.monotonic() - start_time, "Page too large", None
+            body_hash = xxhash.xxh3_64_hexdigest(body)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+            # Identical bytes extract to identical text, skip parse and clean
+            if url_data and url_data.hash and not debug_mode and body_hash == url_data.body_hash:
+                count_stat('total_checks')
+                response_time = time.monotonic() - start_time
+                print(f"📄 Body unchanged, reusing hash in {response_time:.2f}s")
+                return url_data.hash, response_time, None, None
+            
+            html = body.decode(response.charset or 'utf-8', errors='replace')
+            del body
+        
+        # Sub-millisecond with lexbor and xxh3, a thread keeps it off the loop
+        # without the fork/spawn hazards of a process pool
+        loop = asyncio.get_running_loop()
+        content_hash, content_sample = await loop.run_in_executor(None, parse_and_hash, html, debug_mode)
+        if not content_hash:
+            return None, time.monotonic() - start_time, "Quest container not in static HTML", None
+        
+        response_time = time.monotonic() - start_time
+        
+        if url_data:
+            url_data.body_hash = body_hash
+            if (url_data.etag, url_data.last_modified) != (etag, last_modified):
+                url_data.etag = etag
+                url_data.last_modified = last_modified
+                mark_state_dirty()
+        
+        count_stat('total_checks')
+        
+        print(f"🔢 HTTP hash generated: {content_hash[:16]}... in {response_time:.2f}s")
+        return content_hash, response_time, None, content_sample
+        
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return None, time.monotonic() - start_time, f"HTTP error: {str(e) or type(e).__name__}", None
+
+async def fetch_content_hash(url: str, needs_js: bool = False, debug_mode: bool = False, sequential: bool = False, url_data: Optional[URLData] = None) -> Tuple[Optional[str], float, Optional[str], Optional[str], bool]:
+    """Get content hash over HTTP, falling back to Selenium for JS-rendered pages
+    
+    With url_data (monitoring checks), an HTTP URL only falls back after
+    JS_FALLBACK_THRESHOLD consecutive misses, and a Selenium URL retries
+    HTTP every JS_RECHECK_EVERY fetches in case the page became static.
+    
+    Returns (hash, response_time, error, content_sample, used_js)
+    """
+    recheck_http = False
+    if needs_js and url_data is not None:
+        # Counts attempts, not successful checks, so a failing URL isn't probed every cycle
+        url_data.js_checks_since_probe += 1
+        if url_data.js_checks_since_probe >= JS_RECHECK_EVERY:
+            url_data.js_checks_since_probe = 0
+            recheck_http = True
+    if USE_HTTP_FETCH and (not needs_js or recheck_http):
+        # Validators belong to the HTTP hash, a Selenium URL has none to send
+        hash_result, response_time, error, content_sample = await get_content_hash_http(
+            url, debug_mode, url_data if not needs_js else None
+        )
+        if hash_result:
+            if url_data is not None:
+                url_data.http_misses = 0
+            return hash_result, response_time, None, content_sample, False
+        
+        if url_data is not None and not needs_js:
+            url_data.http_misses += 1
+            if url_data.http_misses < JS_FALLBACK_THRESHOLD:
+                # Probably transient, try HTTP again rather than launching Chrome
+                return None, response_time, error, None, False
+        print(f"⚠️ HTTP fetch failed for {url}: {error} - falling back to Selenium")
+    
+    loop = asyncio.get_running_loop()
+    async with browser_gate:
+        future = loop.run_in_executor(
+            None,
+            get_content_hash_optimized,
+            url,
+            False,  # Don't use cache
+            debug_mode,
+            sequential
+        )
+        # Cancelling the check can't stop the thread, so /stop waits on the future itself
+        selenium_futures.add(future)
+        future.add_done_callback(selenium_futures.discard)
+        hash_result, response_time, error, content_sample = await asyncio.shield(future)
+    return hash_result, response_time, error, content_sample, True
 
 # ============================================================================
 # URL CHECKING FUNCTIONS
 # ============================================================================
 
-async def check_single_url(url: str, url_data: URLData) -> Tuple[str, bool, Optional[str]]:
+async def check_single_url(url: str, url_data: URLData, sequential: bool = False) -> Tuple[str, bool, Optional[str]]:
     """Check a single URL for changes"""
     retry_count = 0
     last_error = None
@@ -655,23 +1453,29 @@ async def check_single_url(url: str, url_data: URLData) -> Tuple[str, bool, Opti
     while retry_count < MAX_RETRIES:
         try:
             print(f"\n🔄 Checking URL (attempt {retry_count + 1}/{MAX_RETRIES}): {url}")
-            loop = asyncio.get_event_loop()
-            
             # Don't use cache when checking for changes!
-            hash_result, response_time, error, _ = await loop.run_in_executor(
-                None,
-                get_content_hash_optimized,
-                url,
-                False,  # Don't use cache
-                False   # Not debug mode
-            )
+            async with fetch_gate:
+                hash_result, response_time, error, _, used_js = await fetch_content_hash(url, url_data.needs_js, sequential=sequential, url_data=url_data)
+            
+            if error == PAGE_TIMEOUT_ERROR:
+                url_data.page_timeouts += 1
+                if url_data.page_timeouts < PAGE_TIMEOUT_LIMIT:
+                    # Treated as unchanged, the next cycle gets a fresh attempt
+                    print(f"⏭️ Page load timed out for {url}, assuming unchanged")
+                    return url, False, None
+                # Persistently slow, surface it instead of skipping the URL forever
+                url_data.failures += 1
+                url_data.consecutive_successes = 0
+                url_data.last_error = f"{PAGE_TIMEOUT_ERROR} {url_data.page_timeouts} times in a row"
+                print(f"❌ {url_data.last_error}. Failure #{url_data.failures}/{FAILURE_THRESHOLD}")
+                return url, False, url_data.last_error
             
             if hash_result is None:
                 retry_count += 1
                 last_error = error or "Unknown error"
                 
                 if retry_count < MAX_RETRIES:
-                    delay = RETRY_DELAY_BASE * retry_count
+                    delay = retry_backoff(retry_count)
                     print(f"⏳ Retrying {url} in {delay:.1f}s")
                     print(f"⚠️ Last error: {last_error}")
                     await asyncio.sleep(delay)
@@ -683,13 +1487,25 @@ async def check_single_url(url: str, url_data: URLData) -> Tuple[str, bool, Opti
                     print(f"❌ Max retries reached. Failure #{url_data.failures}/{FAILURE_THRESHOLD}")
                     return url, False, last_error
             
-            # Success - Update statistics
+            # Success - Update statistics (totals only track URLs still monitored)
+            tracked = monitored_urls.get(url) is url_data
+            if tracked:
+                url_totals.add(url_data, -1)
             url_data.failures = 0
             url_data.consecutive_successes += 1
+            url_data.page_timeouts = 0
             url_data.last_error = None
             url_data.check_count += 1
             url_data.update_response_time(response_time)
-            url_data.last_checked = time.time()
+            url_data.last_checked = time.monotonic()
+            
+            # HTTP and Selenium hashes differ, re-baseline when the source switches
+            if used_js != url_data.needs_js:
+                print(f"🔀 {url} now fetched via {'Selenium' if used_js else 'HTTP'}, re-baselining hash")
+                url_data.needs_js = used_js
+                url_data.hash = hash_result
+                url_data.etag = url_data.last_modified = url_data.body_hash = None
+                mark_state_dirty()
             
             # Check for changes
             has_changes = False
@@ -699,14 +1515,19 @@ async def check_single_url(url: str, url_data: URLData) -> Tuple[str, bool, Opti
                 print(f"   Old hash: {url_data.hash[:16]}...")
                 print(f"   New hash: {hash_result[:16]}...")
                 url_data.total_changes += 1
-                stats['total_changes'] += 1
+                count_stat('total_changes')
+                # Active page, go back to the base rate
+                url_data.interval = CHECK_INTERVAL
             else:
+                url_data.interval = min(max(url_data.interval, CHECK_INTERVAL) * URL_INTERVAL_BACKOFF, MAX_URL_INTERVAL)
                 print(f"✓ No changes for {url}")
                 print(f"   Current hash: {hash_result[:16]}...")
                 print(f"   Response time: {response_time:.2f}s")
             
             # Update hash
             url_data.hash = hash_result
+            if tracked:
+                url_totals.add(url_data)
             
             return url, has_changes, None
                 
@@ -716,8 +1537,8 @@ async def check_single_url(url: str, url_data: URLData) -> Tuple[str, bool, Opti
             print(f"⚠️ Error checking {url}: {last_error}")
             
             if retry_count < MAX_RETRIES:
-                delay = RETRY_DELAY_BASE * retry_count
-                print(f"⏳ Retrying after error in {delay}s...")
+                delay = retry_backoff(retry_count)
+                print(f"⏳ Retrying after error in {delay:.1f}s...")
                 await asyncio.sleep(delay)
             else:
                 url_data.failures += 1
@@ -727,6 +1548,66 @@ async def check_single_url(url: str, url_data: URLData) -> Tuple[str, bool, Opti
     
     return url, False, last_error
 
+def process_url_result(url: str, has_changes: bool, error: Optional[str], current_time: float,
+                       changes_detected: List[dict], urls_to_remove: List[str]):
+    """Collect change notifications and failed URLs from a check result"""
+    url_data = monitored_urls.get(url)
+    if url_data is None:
+        return
+    
+    url_data.next_check = current_time + effective_interval(url_data)
+    
+    # Fast path: a successful check without changes needs no further work
+    # (check_single_url already reset failures and updated the counters)
+    if not has_changes and error is None:
+        return
+    
+    mark_state_dirty()
+    
+    if has_changes and current_time - url_data.last_notified > NOTIFICATION_COOLDOWN:
+        changes_detected.append({
+            'url': url,
+            'response_time': url_data.avg_response_time,
+            'check_count': url_data.check_count,
+            'total_changes': url_data.total_changes
+        })
+        url_data.last_notified = current_time
+    
+    if url_data.failures > FAILURE_THRESHOLD:
+        urls_to_remove.append(url)
+
+async def dispatch_cycle_results(changes_detected: List[dict], urls_to_remove: List[str]):
+    """Queue change alerts and drop URLs that exceeded the failure threshold"""
+    if changes_detected:
+        now = datetime.now().strftime('%H:%M:%S')
+        for change in changes_detected:
+            change['now'] = now
+            change['url'] = html.escape(change['url'])
+            enqueue_notification(CHANGE_TEMPLATE.format_map(change), True)
+    
+    for url in urls_to_remove:
+        if url in monitored_urls:
+            untrack_url(url)
+            await enqueue_notification_reliable(REMOVED_TEMPLATE.format(url=html.escape(url)))
+
+def effective_interval(url_data: URLData) -> float:
+    """Seconds between checks of a URL after adaptive back-off"""
+    return url_data.interval or CHECK_INTERVAL
+
+def describe_interval() -> str:
+    """Base interval plus the back-off cap, for user-facing messages"""
+    return f"{CHECK_INTERVAL}s (quiet pages back off to {MAX_URL_INTERVAL}s)"
+
+def reset_url_intervals():
+    """Restart adaptive back-off from the base interval, checking every URL next cycle"""
+    for url_data in monitored_urls.values():
+        url_data.interval = 0.0
+        url_data.next_check = 0.0
+
+def is_check_due(url_data: URLData, current_time: float) -> bool:
+    """Whether a URL's adaptive interval has elapsed (1s slack for cycle jitter)"""
+    return url_data.next_check - current_time <= 1
+
 async def check_urls_parallel(bot):
     """Check URLs in parallel for maximum speed"""
     global monitored_urls
@@ -734,72 +1615,42 @@ async def check_urls_parallel(bot):
     if not monitored_urls:
         return
     
-    current_time = time.time()
+    current_time = time.monotonic()
     changes_detected = []
     urls_to_remove = []
     
+    due = [(url, url_data) for url, url_data in get_url_snapshot() if is_check_due(url_data, current_time)]
+    
     print(f"\n{'='*60}")
-    print(f"🚀 PARALLEL CHECK: {len(monitored_urls)} URLs")
+    print(f"🚀 PARALLEL CHECK: {len(due)}/{len(monitored_urls)} URLs due")
     print(f"{'='*60}")
     
-    # Create tasks for parallel execution
-    tasks = []
-    for url, url_data in list(monitored_urls.items()):
-        task = asyncio.create_task(check_single_url(url, url_data))
-        tasks.append(task)
+    # Fixed pool of workers, each takes the next URL as soon as it is free
+    work_queue = asyncio.Queue()
+    for item in due:
+        work_queue.put_nowait(item)
     
-    # Wait for all tasks to complete
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def worker():
+        while True:
+            try:
+                url, url_data = work_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            # /remove may have dropped it while it was queued
+            if url not in monitored_urls:
+                continue
+            try:
+                url, has_changes, error = await check_single_url(url, url_data)
+            except Exception as e:
+                print(f"❌ Task exception: {e}")
+                continue
+            process_url_result(url, has_changes, error, current_time, changes_detected, urls_to_remove)
     
-    # Process results
-    for result in results:
-        if isinstance(result, Exception):
-            print(f"❌ Task exception: {result}")
-        else:
-            url, has_changes, error = result
-            if url in monitored_urls:
-                url_data = monitored_urls[url]
-                
-                if has_changes:
-                    if current_time - url_data.last_notified > 60:
-                        changes_detected.append({
-                            'url': url,
-                            'response_time': url_data.avg_response_time,
-                            'check_count': url_data.check_count,
-                            'total_changes': url_data.total_changes
-                        })
-                        url_data.last_notified = current_time
-                
-                if url_data.failures > FAILURE_THRESHOLD:
-                    urls_to_remove.append(url)
-    
-    # Send notifications
-    for change in changes_detected:
-        notification = (
-            f"🚨 **CHANGE DETECTED!**\n"
-            f"📍 **URL:** {change['url']}\n"
-            f"⚡ **Response Time:** {change['response_time']:.2f}s\n"
-            f"📊 **Check #{change['check_count']}**\n"
-            f"🔄 **Total changes:** {change['total_changes']}\n"
-            f"🕐 **Time:** {datetime.now().strftime('%H:%M:%S')}\n"
-        )
-        await notification_queue.put((notification, True))
+    await asyncio.gather(*(worker() for _ in range(min(MAX_PARALLEL_CHECKS, len(due)))))
     
-    # Remove failed URLs
-    for url in urls_to_remove:
-        if url in monitored_urls:
-            del monitored_urls[url]
-            notification = (
-                f"🔴 **URL REMOVED**\n"
-                f"━━━━━━━━━━━━━━━━━━\n"
-                f"📍 **URL:** {url}\n"
-                f"❌ **Reason:** Too many failures\n"
-                f"━━━━━━━━━━━━━━━━━━"
-            )
-            await notification_queue.put((notification, False))
+    await dispatch_cycle_results(changes_detected, urls_to_remove)
     
     print(f"✅ Parallel check complete: {len(changes_detected)} changes")
-    save_bot_state()
 
 async def check_urls_sequential(bot):
     """Check URLs sequentially for reliability"""
@@ -808,106 +1659,138 @@ async def check_urls_sequential(bot):
     if not monitored_urls:
         return
     
-    current_time = time.time()
+    current_time = time.monotonic()
     changes_detected = []
     urls_to_remove = []
     
     print(f"\n{'='*60}")
-    print(f"🔍 SEQUENTIAL CHECK: {len(monitored_urls)} URLs")
+    print(f"🔍 SEQUENTIAL CHECK: {len(monitored_urls)} URLs tracked")
     print(f"{'='*60}")
     
-    for url, url_data in list(monitored_urls.items()):
-        url, has_changes, error = await check_single_url(url, url_data)
-        
-        if url in monitored_urls:
-            url_data = monitored_urls[url]
-            
-            if has_changes:
-                if current_time - url_data.last_notified > 60:
-                    changes_detected.append({
-                        'url': url,
-                        'response_time': url_data.avg_response_time,
-                        'check_count': url_data.check_count,
-                        'total_changes': url_data.total_changes
-                    })
-                    url_data.last_notified = current_time
-            
-            if url_data.failures > FAILURE_THRESHOLD:
-                urls_to_remove.append(url)
-    
-    # Send notifications
-    for change in changes_detected:
-        notification = (
-            f"🚨 **CHANGE DETECTED!**\n"
-            f"📍 **URL:** {change['url']}\n"
-            f"⚡ **Response Time:** {change['response_time']:.2f}s\n"
-            f"📊 **Check #{change['check_count']}**\n"
-            f"🔄 **Total changes:** {change['total_changes']}\n"
-            f"🕐 **Time:** {datetime.now().strftime('%H:%M:%S')}\n"
-        )
-        await notification_queue.put((notification, True))
+    # Snapshot: /remove may mutate monitored_urls while a check is awaited
+    for url, url_data in get_url_snapshot():
+        if url not in monitored_urls or not is_check_due(url_data, current_time):
+            continue
+        url, has_changes, error = await check_single_url(url, url_data, sequential=True)
+        process_url_result(url, has_changes, error, current_time, changes_detected, urls_to_remove)
     
-    # Remove failed URLs
-    for url in urls_to_remove:
-        if url in monitored_urls:
-            del monitored_urls[url]
-            notification = (
-                f"🔴 **URL REMOVED**\n"
-                f"📍 **URL:** {url}\n"
-                f"❌ **Reason:** Too many failures\n"
-            )
-            await notification_queue.put((notification, False))
+    await dispatch_cycle_results(changes_detected, urls_to_remove)
     
     print(f"✅ Sequential check complete: {len(changes_detected)} changes")
-    save_bot_state()
 
 # ============================================================================
 # BACKGROUND TASKS
 # ============================================================================
 
+def enqueue_notification(message: str, priority: bool = False):
+    """Queue a notification, dropping the oldest droppable one if the queue is full"""
+    if not notification_queue.put_dropping((message, priority, True)):
+        count_stat('notifications_dropped')
+
+async def enqueue_notification_reliable(message: str, priority: bool = False):
+    """Queue a notification that must not be dropped, waiting for space"""
+    await notification_queue.put((message, priority, False))
+
 async def notification_sender(bot):
     """Send notifications from queue"""
+    pending = None
+    unsent: List[tuple] = []  # Chunks of the message being sent, not yet delivered
+    try:
+        while True:
+            try:
+                if pending is None:
+                    pending = await notification_queue.get()
+                message, priority, droppable = pending
+                pending = None
+                
+                # The chat only takes ~1 message/s, fold alerts that queued up meanwhile
+                while not notification_queue.empty():
+                    queued = notification_queue.get_nowait()
+                    if len(message) + len(queued[0]) + 2 > TELEGRAM_MESSAGE_LIMIT:
+                        pending = queued
+                        break
+                    message = f"{message}\n\n{queued[0]}"
+                    priority = priority or queued[1]
+                    droppable = droppable and queued[2]
+                
+                retries = 2 if priority else 1
+                unsent = [(chunk, priority, droppable) for chunk in split_message(message)]
+                while unsent:
+                    chunk = unsent[0][0]
+                    attempt = 0
+                    while attempt < retries:
+                        try:
+                            await telegram_limiter.acquire()
+                            await chat_limiter.acquire()
+                            await bot.send_message(
+                                chat_id=CHAT_ID, 
+                                text=chunk,
+                                parse_mode=ParseMode.HTML
+                            )
+                            break
+                        except RetryAfter as e:
+                            # Flood control isn't a failure, wait as told and resend
+                            print(f"⏳ Telegram flood control, retrying in {e.retry_after}s")
+                            await asyncio.sleep(e.retry_after)
+                        except Exception as e:
+                            attempt += 1
+                            if attempt == retries:
+                                print(f"❌ Failed to send: {e}")
+                            else:
+                                await asyncio.sleep(1)
+                    unsent.pop(0)
+                            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Notification error: {e}")
+                unsent = []
+                await asyncio.sleep(1)
+    except asyncio.CancelledError:
+        # Stopped mid-send (/stop, shutdown): hand back what was taken off the queue
+        # so the next sender delivers it, must-deliver notices included
+        if pending is not None:
+            notification_queue.put_front(pending)
+        for item in reversed(unsent):
+            notification_queue.put_front(item)
+        raise
+
+async def state_saver():
+    """Write state at most once per STATE_SAVE_INTERVAL, and only if it changed"""
     while True:
         try:
-            message, priority = await notification_queue.get()
-            
-            retries = 2 if priority else 1
-            for attempt in range(retries):
-                try:
-                    await bot.send_message(
-                        chat_id=CHAT_ID, 
-                        text=message,
-                        parse_mode='Markdown'
-                    )
-                    break
-                except Exception as e:
-                    if attempt == retries - 1:
-                        print(f"❌ Failed to send: {e}")
-                    else:
-                        await asyncio.sleep(1)
-                        
+            await asyncio.sleep(STATE_SAVE_INTERVAL)
+            if state_dirty:
+                await save_bot_state_async()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ State saver error: {e}")
+
+async def cpu_sampler():
+    """Sample process CPU usage so /memory doesn't block the loop measuring it"""
+    global cpu_sample
+    current_process.cpu_percent(None)  # Prime, the first non-blocking call returns 0
+    while True:
+        await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+        try:
+            cpu_sample = current_process.cpu_percent(None)
         except Exception as e:
-            print(f"❌ Notification error: {e}")
-            await asyncio.sleep(1)
+            print(f"⚠️ Error sampling CPU usage: {e}")
 
 async def memory_monitor():
     """Monitor memory usage"""
     while True:
         try:
             memory_mb = get_memory_usage()
+            update_memory_pressure(memory_mb)
             
             if memory_mb > MEMORY_LIMIT_MB:
                 print(f"🚨 MEMORY ALERT: {memory_mb:.1f}MB")
-                save_bot_state()
+                await save_bot_state_async()
                 
-                with driver_pool_lock:
-                    for driver in driver_pool:
-                        try:
-                            driver.quit()
-                        except:
-                            pass
-                    driver_pool.clear()
-                    driver_usage_count.clear()
+                # Quit drivers off the event loop, lock is only held to drain
+                await quit_drivers(drain_driver_pool())
                 
                 cleanup_memory()
                 
@@ -917,7 +1800,7 @@ async def memory_monitor():
                 
             elif memory_mb > MEMORY_WARNING_MB:
                 print(f"🟡 WARNING: {memory_mb:.1f}MB")
-                gc.collect()
+                collect_garbage(memory_mb)
                 
             await asyncio.sleep(MEMORY_CHECK_INTERVAL)
             
@@ -925,63 +1808,85 @@ async def memory_monitor():
             print(f"❌ Memory monitor error: {e}")
             await asyncio.sleep(10)
 
+async def cache_sweeper():
+    """Drop expired content cache entries once per TTL window"""
+    while True:
+        await asyncio.sleep(CONTENT_CACHE_TTL)
+        now = time.monotonic()
+        ttl = effective_cache_ttl()
+        with cache_lock:
+            expired = [url for url, (_, timestamp) in content_cache.items()
+                       if now - timestamp >= ttl]
+            for url in expired:
+                del content_cache[url]
+        if expired:
+            print(f"🧹 Swept {len(expired)} expired cache entries")
+
 async def start_monitoring(bot):
     """Main monitoring loop"""
-    global is_monitoring
-    
     mode = "Parallel" if not USE_SEQUENTIAL_MODE else "Sequential"
     
-    await notification_queue.put((
-        f"🟢 **MONITORING ACTIVE**\n"
-        f"Tracking {len(monitored_urls)} URLs\n"
-        f"Mode: {mode}\n"
-        f"Check Interval: {CHECK_INTERVAL}s",
-        True
-    ))
-    
-    print(f"🚀 Starting monitoring ({mode})")
-    cycle_count = 0
-    
-    while is_monitoring:
-        try:
-            cycle_count += 1
-            memory_mb = get_memory_usage()
-            
-            print(f"\n{'='*60}")
-            print(f"🔄 MONITORING CYCLE #{cycle_count}")
-            print(f"📊 URLs: {len(monitored_urls)} | Memory: {memory_mb:.1f}MB")
-            print(f"{'='*60}")
-            
-            start_time = time.time()
-            
-            # Choose checking method
-            if USE_SEQUENTIAL_MODE:
-                await check_urls_sequential(bot)
-            else:
-                await check_urls_parallel(bot)
-            
-            elapsed = time.time() - start_time
-            wait_time = max(CHECK_INTERVAL - elapsed, 1)
-            
-            print(f"\n📊 CYCLE STATS:")
-            print(f"  • Completed in: {elapsed:.2f}s")
-            print(f"  • Next check in: {wait_time:.2f}s")
-            
-            await asyncio.sleep(wait_time)
-            
-        except asyncio.CancelledError:
-            print("🚫 Monitoring cancelled")
-            break
-        except Exception as e:
-            print(f"❌ Error in monitoring cycle: {e}")
-            print(f"❌ Full traceback: {traceback.format_exc()}")
-            await notification_queue.put((
-                f"⚠️ **Monitoring Error**\n{str(e)[:100]}",
-                False
-            ))
-            await asyncio.sleep(10)
+    # The caller (/run reply or auto-restart notice) already announced the start
+    logger.info("🚀 Starting monitoring (%s)", mode)
+    loop = asyncio.get_running_loop()
+    # Refreshed after every cycle, the next cycle's log line reuses that reading
+    memory_mb = get_memory_usage()
     
-    print("👋 Monitoring stopped")
+    try:
+        while monitor_state.running:
+            try:
+                monitor_state.cycle += 1
+                cycle_count = monitor_state.cycle
+                
+                logger.debug("=" * 60)
+                logger.info("🔄 MONITORING CYCLE #%d | URLs: %d | Memory: %.1fMB",
+                            cycle_count, len(monitored_urls), memory_mb)
+                
+                # Deadline on the loop's own clock, the one asyncio.sleep is scheduled against
+                next_deadline = loop.time() + CHECK_INTERVAL
+                start_ns = time.perf_counter_ns()
+                
+                # Choose checking method
+                if USE_SEQUENTIAL_MODE:
+                    await check_urls_sequential(bot)
+                else:
+                    await check_urls_parallel(bot)
+                
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                monitor_state.last_cycle_ns = elapsed_ns
+                elapsed = elapsed_ns / 1e9
+                
+                # Cycles are aligned to start + interval instead of end + interval
+                if elapsed > CHECK_INTERVAL:
+                    logger.warning("⏱️ Cycle #%d overran: %.2fs > %ss interval, starting next cycle now",
+                                   cycle_count, elapsed, CHECK_INTERVAL)
+                
+                # Full collection only when memory is actually high
+                memory_mb = get_memory_usage()
+                if memory_mb > MEMORY_WARNING_MB:
+                    freed = collect_garbage(memory_mb)
+                    logger.info("🗑️ Post-cycle GC freed %d objects at %.1fMB", freed, memory_mb)
+                
+                wait_time = max(0, next_deadline - loop.time())
+                logger.info("📊 Cycle #%d completed in %.2fs, next check in %.2fs",
+                            cycle_count, elapsed, wait_time)
+                
+                await asyncio.sleep(wait_time)
+                
+            except asyncio.CancelledError:
+                # Propagate so the canceller's wait() sees the task as cancelled
+                logger.info("🚫 Monitoring cancelled")
+                raise
+            except Exception as e:
+                # Traceback is only formatted if a handler emits the record
+                logger.exception("❌ Error in monitoring cycle: %s", e)
+                enqueue_notification(
+                    f"⚠️ <b>Monitoring Error</b>\n{html.escape(str(e)[:100])}",
+                    False
+                )
+                await asyncio.sleep(10)
+    finally:
+        logger.info("👋 Monitoring stopped")
 
 # ============================================================================
 # TELEGRAM COMMAND HANDLERS
@@ -1001,28 +1906,28 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     mode = "Parallel 🚀" if not USE_SEQUENTIAL_MODE else "Sequential 🔒"
     
     welcome_msg = (
-        "🚀 **ZEALY BOT v2.0 FIXED**\n"
-        "━━━━━━━━━━━━━━━━━━\n\n"
-        f"⚡ **Mode: {mode}**\n"
-        f"• Check Interval: {CHECK_INTERVAL}s\n"
+        "🚀 <b>ZEALY BOT v2.0 FIXED</b>\n"
+        f"{BAR}\n\n"
+        f"⚡ <b>Mode: {mode}</b>\n"
+        f"• Check Interval: {describe_interval()}\n"
         f"• Max URLs: {MAX_URLS}\n\n"
-        "📋 **COMMANDS:**\n"
-        "`/add <url>` - Add Zealy URL\n"
-        "`/remove <num>` - Remove URL\n"
-        "`/list` - Show all URLs\n"
-        "`/run` - Start monitoring\n"
-        "`/stop` - Stop monitoring\n"
-        "`/status` - Statistics\n"
-        "`/debug <num>` - Debug URL\n"
-        "`/clear` - Clear cache\n"
-        "`/memory` - Memory usage\n"
-        "`/mode` - Toggle mode\n"
-        "`/help` - Show this message\n\n"
-        f"💾 **Memory:** {memory_mb:.1f}/{MEMORY_LIMIT_MB}MB\n"
-        "━━━━━━━━━━━━━━━━━━"
+        "📋 <b>COMMANDS:</b>\n"
+        "<code>/add &lt;url&gt;</code> - Add Zealy URL\n"
+        "<code>/remove &lt;num&gt;</code> - Remove URL\n"
+        "<code>/list</code> - Show all URLs\n"
+        "<code>/run</code> - Start monitoring\n"
+        "<code>/stop</code> - Stop monitoring\n"
+        "<code>/status</code> - Statistics\n"
+        "<code>/debug &lt;num&gt;</code> - Debug URL\n"
+        "<code>/clear</code> - Clear cache\n"
+        "<code>/memory</code> - Memory usage\n"
+        "<code>/mode</code> - Toggle mode\n"
+        "<code>/help</code> - Show this message\n\n"
+        f"💾 <b>Memory:</b> {memory_mb:.1f}/{MEMORY_LIMIT_MB}MB\n"
+        f"{BAR}"
     )
     
-    await update.message.reply_text(welcome_msg, parse_mode='Markdown')
+    await update.message.reply_text(welcome_msg, parse_mode=ParseMode.HTML)
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Help command"""
@@ -1032,292 +1937,288 @@ async def add_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Add URL command"""
     if len(monitored_urls) >= MAX_URLS:
         await update.message.reply_text(
-            f"❌ **Maximum Capacity**\n"
+            f"❌ <b>Maximum Capacity</b>\n"
             f"Currently monitoring {MAX_URLS} URLs",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.HTML
         )
         return
     
     if not context.args:
         await update.message.reply_text(
-            "❌ **Usage:**\n"
-            "`/add https://zealy.io/cw/projectname`",
-            parse_mode='Markdown'
+            "❌ <b>Usage:</b>\n"
+            "<code>/add https://zealy.io/cw/projectname</code>",
+            parse_mode=ParseMode.HTML
         )
         return
     
-    url = context.args[0].lower()
+    url = normalize_url(context.args[0].lower())
     
-    if not re.match(r'^https://(www\.)?zealy\.io/cw/[\w/-]+', url):
+    if not ZEALY_URL_RE.match(url):
         await update.message.reply_text(
-            "❌ **Invalid Zealy URL**\n"
-            "Format: `https://zealy.io/cw/name`",
-            parse_mode='Markdown'
+            "❌ <b>Invalid Zealy URL</b>\n"
+            "Format: <code>https://zealy.io/cw/name</code>",
+            parse_mode=ParseMode.HTML
         )
         return
     
     if url in monitored_urls:
         await update.message.reply_text(
-            f"ℹ️ **Already Monitoring**\n{url}",
-            parse_mode='Markdown'
+            f"ℹ️ <b>Already Monitoring</b>\n{html.escape(url)}",
+            parse_mode=ParseMode.HTML
         )
         return
     
     msg = await update.message.reply_text(
-        f"⏳ **Verifying URL...**\n{url}",
-        parse_mode='Markdown'
+        f"⏳ <b>Verifying URL...</b>\n{html.escape(url)}",
+        parse_mode=ParseMode.HTML
     )
     
     try:
-        loop = asyncio.get_event_loop()
-        hash_result, response_time, error, _ = await loop.run_in_executor(
-            None,
-            get_content_hash_optimized,
-            url,
-            False,
-            False
-        )
+        hash_result, response_time, error, _, used_js = await fetch_content_hash(url)
         
         if not hash_result:
             await msg.edit_text(
-                f"❌ **Failed to Add**\n"
-                f"Error: {error}",
-                parse_mode='Markdown'
+                f"❌ <b>Failed to Add</b>\n"
+                f"Error: {html.escape(str(error))}",
+                parse_mode=ParseMode.HTML
             )
             return
         
-        monitored_urls[url] = URLData(
+        # Another /add for the same page may have finished while we fetched
+        if url in monitored_urls:
+            await msg.edit_text(
+                f"ℹ️ <b>Already Monitoring</b>\n{html.escape(url)}",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        track_url(url, URLData(
             hash=hash_result,
             last_notified=0,
-            last_checked=time.time(),
+            last_checked=time.monotonic(),
             failures=0,
             consecutive_successes=1,
             check_count=1,
             avg_response_time=response_time,
             total_changes=0,
-            added_time=time.time()
-        )
+            added_time=time.time(),
+            short_name=get_short_name(url),
+            needs_js=used_js
+        ))
         
-        save_bot_state()
+        mark_state_dirty()
         
         await msg.edit_text(
-            f"✅ **Added Successfully!**\n"
-            f"📍 {url}\n"
+            f"✅ <b>Added Successfully!</b>\n"
+            f"📍 {html.escape(url)}\n"
             f"⚡ Load time: {response_time:.2f}s\n"
             f"📊 Slot: {len(monitored_urls)}/{MAX_URLS}",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.HTML
         )
         
     except Exception as e:
         await msg.edit_text(
-            f"❌ **Error**\n{str(e)[:100]}",
-            parse_mode='Markdown'
+            f"❌ <b>Error</b>\n{html.escape(str(e)[:100])}",
+            parse_mode=ParseMode.HTML
         )
 
 async def list_urls(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """List URLs command"""
     if not monitored_urls:
         await update.message.reply_text(
-            "📋 **No URLs Monitored**\n"
-            "Use `/add <url>` to add",
-            parse_mode='Markdown'
+            "📋 <b>No URLs Monitored</b>\n"
+            "Use <code>/add &lt;url&gt;</code> to add",
+            parse_mode=ParseMode.HTML
         )
         return
     
-    lines = ["📋 **MONITORED URLS**"]
+    buf = io.StringIO()
+    buf.write("📋 <b>MONITORED URLS</b>\n")
     
-    for idx, (url, data) in enumerate(monitored_urls.items(), 1):
+    for idx, (url, data) in enumerate(get_url_snapshot(), 1):
+        # Stop at an entry boundary so no HTML tag is cut off under the cap
+        if buf.tell() > LIST_REPLY_CUTOFF:
+            buf.write(f"… and {len(monitored_urls) - idx + 1} more\n\n")
+            break
         status = "🟢" if data.failures == 0 else "🟡" if data.failures < FAILURE_THRESHOLD else "🔴"
-        url_short = url.replace("https://zealy.io/cw/", "")
-        
-        lines.append(f"**{idx}.** {status} **{url_short}**")
-        lines.append(f"   ⚡ {data.avg_response_time:.1f}s | 📊 {data.check_count} checks")
+        buf.write(f"<b>{idx}.</b> {status} <b>{html.escape(data.short_name)}</b>\n")
+        buf.write(f"   ⚡ {data.avg_response_time:.1f}s | 📊 {data.check_count} checks | ⏱️ every {effective_interval(data):.0f}s\n")
         
         if data.total_changes > 0:
-            lines.append(f"   🔄 {data.total_changes} changes")
-        lines.append("")
+            buf.write(f"   🔄 {data.total_changes} changes\n")
+        buf.write("\n")
     
-    lines.append(f"**Total: {len(monitored_urls)}/{MAX_URLS}**")
+    buf.write(f"<b>Total: {len(monitored_urls)}/{MAX_URLS}</b>")
     
-    await update.message.reply_text("\n".join(lines), parse_mode='Markdown')
+    await update.message.reply_text(buf.getvalue(), parse_mode=ParseMode.HTML)
 
 async def remove_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Remove URL command"""
     if not monitored_urls:
         await update.message.reply_text(
-            "❌ **No URLs to Remove**",
-            parse_mode='Markdown'
+            "❌ <b>No URLs to Remove</b>",
+            parse_mode=ParseMode.HTML
         )
         return
     
     if not context.args:
         await update.message.reply_text(
-            "❌ **Usage:** `/remove <number>`\n"
-            "Use `/list` to see numbers",
-            parse_mode='Markdown'
+            "❌ <b>Usage:</b> <code>/remove &lt;number&gt;</code>\n"
+            "Use <code>/list</code> to see numbers",
+            parse_mode=ParseMode.HTML
         )
         return
     
     try:
         idx = int(context.args[0]) - 1
-        urls = list(monitored_urls.keys())
         
-        if idx < 0 or idx >= len(urls):
+        if idx < 0 or idx >= len(url_order):
             await update.message.reply_text(
-                f"❌ **Invalid Number**\n"
-                f"Use 1-{len(urls)}",
-                parse_mode='Markdown'
+                f"❌ <b>Invalid Number</b>\n"
+                f"Use 1-{len(url_order)}",
+                parse_mode=ParseMode.HTML
             )
             return
         
-        url = urls[idx]
-        del monitored_urls[url]
+        url = url_order[idx]
+        untrack_url(url, idx)
         
         with cache_lock:
             if url in content_cache:
                 del content_cache[url]
         
-        save_bot_state()
+        mark_state_dirty()
         
         await update.message.reply_text(
-            f"✅ **URL Removed**\n{url}\n"
+            f"✅ <b>URL Removed</b>\n{html.escape(url)}\n"
             f"📋 Remaining: {len(monitored_urls)}/{MAX_URLS}",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.HTML
         )
         
     except ValueError:
         await update.message.reply_text(
-            "❌ **Invalid Number**",
-            parse_mode='Markdown'
+            "❌ <b>Invalid Number</b>",
+            parse_mode=ParseMode.HTML
         )
 
 async def debug_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Debug URL command"""
     if not context.args:
         await update.message.reply_text(
-            "❌ **Usage:** `/debug <number>`",
-            parse_mode='Markdown'
+            "❌ <b>Usage:</b> <code>/debug &lt;number&gt;</code>",
+            parse_mode=ParseMode.HTML
         )
         return
     
     try:
         idx = int(context.args[0]) - 1
-        urls = list(monitored_urls.keys())
         
-        if idx < 0 or idx >= len(urls):
+        if idx < 0 or idx >= len(url_order):
             await update.message.reply_text(
-                f"❌ **Invalid Number**",
-                parse_mode='Markdown'
+                f"❌ <b>Invalid Number</b>",
+                parse_mode=ParseMode.HTML
             )
             return
         
-        url = urls[idx]
+        url = url_order[idx]
         url_data = monitored_urls[url]
         
         msg = await update.message.reply_text(
-            f"🔍 **Debugging URL...**\n{url}",
-            parse_mode='Markdown'
+            f"🔍 <b>Debugging URL...</b>\n{html.escape(url)}",
+            parse_mode=ParseMode.HTML
         )
         
-        loop = asyncio.get_event_loop()
-        hash_result, response_time, error, content_sample = await loop.run_in_executor(
-            None,
-            get_content_hash_optimized,
+        hash_result, response_time, error, content_sample, used_js = await fetch_content_hash(
             url,
-            False,
-            True  # Debug mode
+            url_data.needs_js,
+            debug_mode=True
         )
         
         if hash_result:
             change_status = "✅ NO CHANGE" if url_data.hash == hash_result else "🔄 CHANGE DETECTED"
             
             debug_text = (
-                f"🔍 **DEBUG RESULTS**\n"
-                f"📍 {url}\n\n"
-                f"**Status:** {change_status}\n"
-                f"**Current Hash:** `{hash_result[:16]}...`\n"
-                f"**Stored Hash:** `{url_data.hash[:16] if url_data.hash else 'None'}...`\n"
-                f"**Response Time:** {response_time:.2f}s\n\n"
-                f"**Content Sample:**\n"
-                f"```\n{content_sample[:500] if content_sample else 'No content'}\n```"
+                f"🔍 <b>DEBUG RESULTS</b>\n"
+                f"📍 {html.escape(url)}\n\n"
+                f"<b>Status:</b> {change_status}\n"
+                f"<b>Current Hash:</b> <code>{hash_result[:16]}...</code>\n"
+                f"<b>Stored Hash:</b> <code>{url_data.hash[:16] if url_data.hash else 'None'}...</code>\n"
+                f"<b>Response Time:</b> {response_time:.2f}s\n"
+                f"<b>Fetched via:</b> {'Selenium' if used_js else 'HTTP'}\n\n"
+                f"<b>Content Sample:</b>\n"
+                f"<pre>{html.escape(content_sample[:500]) if content_sample else 'No content'}</pre>"
             )
             
-            await msg.edit_text(debug_text[:4000], parse_mode='Markdown')
+            await msg.edit_text(debug_text[:4000], parse_mode=ParseMode.HTML)
         else:
             await msg.edit_text(
-                f"❌ **Debug Failed**\n"
-                f"Error: {error}",
-                parse_mode='Markdown'
+                f"❌ <b>Debug Failed</b>\n"
+                f"Error: {html.escape(str(error))}",
+                parse_mode=ParseMode.HTML
             )
             
     except ValueError:
         await update.message.reply_text(
-            "❌ **Invalid Number**",
-            parse_mode='Markdown'
+            "❌ <b>Invalid Number</b>",
+            parse_mode=ParseMode.HTML
         )
 
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Status command"""
     if not monitored_urls:
         await update.message.reply_text(
-            "📊 **No URLs Being Monitored**",
-            parse_mode='Markdown'
+            "📊 <b>No URLs Being Monitored</b>",
+            parse_mode=ParseMode.HTML
         )
         return
     
-    total_checks = sum(d.check_count for d in monitored_urls.values())
-    total_changes = sum(d.total_changes for d in monitored_urls.values())
-    avg_times = [d.avg_response_time for d in monitored_urls.values()]
-    overall_avg = sum(avg_times) / len(avg_times) if avg_times else 0
+    overall_avg = max(url_totals.response_time, 0.0) / len(monitored_urls)
+    intervals = [effective_interval(url_data) for _, url_data in get_url_snapshot()]
     
     memory_mb = get_memory_usage()
-    uptime = int(time.time() - stats['start_time'])
+    uptime = int(time.monotonic() - process_start)
     hours = uptime // 3600
     minutes = (uptime % 3600) // 60
     
     status_text = (
-        f"📊 **STATUS REPORT**\n"
-        f"**📈 MONITORING**\n"
+        f"📊 <b>STATUS REPORT</b>\n"
+        f"<b>📈 MONITORING</b>\n"
         f"• URLs: {len(monitored_urls)}/{MAX_URLS}\n"
-        f"• Total Checks: {total_checks}\n"
-        f"• Total Changes: {total_changes}\n"
+        f"• Total Checks: {url_totals.checks}\n"
+        f"• Total Changes: {url_totals.changes}\n"
         f"• Avg Response: {overall_avg:.2f}s\n"
-        f"• Status: {'🟢 Active' if is_monitoring else '🔴 Stopped'}\n\n"
-        f"**💾 SYSTEM**\n"
+        f"• Check Intervals: {min(intervals):.0f}-{max(intervals):.0f}s (base {CHECK_INTERVAL}s)\n"
+        f"• Last Cycle: {monitor_state.last_cycle_ns / 1e6:.0f}ms\n"
+        f"• Status: {'🟢 Active' if monitor_state.running else '🔴 Stopped'}\n\n"
+        f"<b>💾 SYSTEM</b>\n"
         f"• Memory: {memory_mb:.1f}/{MEMORY_LIMIT_MB}MB\n"
         f"• Uptime: {hours}h {minutes}m\n"
         f"• Mode: {'Parallel' if not USE_SEQUENTIAL_MODE else 'Sequential'}\n"
     )
     
-    await update.message.reply_text(status_text, parse_mode='Markdown')
+    await update.message.reply_text(status_text, parse_mode=ParseMode.HTML)
 
 async def clear_cache(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Clear cache command"""
     with cache_lock:
         old_size = len(content_cache)
         content_cache.clear()
+    hash_page_text.cache_clear()
     
-    with driver_pool_lock:
-        old_pool = len(driver_pool)
-        for driver in driver_pool:
-            try:
-                driver.quit()
-            except:
-                pass
-        driver_pool.clear()
-        driver_usage_count.clear()
+    drivers = drain_driver_pool()
+    old_pool = len(drivers)
+    await quit_drivers(drivers)
     
-    memory_before = get_memory_usage()
-    cleanup_memory()
-    memory_after = get_memory_usage()
+    memory_before = get_memory_usage(max_age=0)
+    memory_after = cleanup_memory()
     
     await update.message.reply_text(
-        f"🧹 **CACHE CLEARED**\n"
+        f"🧹 <b>CACHE CLEARED</b>\n"
         f"• Cache: {old_size} entries\n"
         f"• Drivers: {old_pool} closed\n"
         f"• Memory freed: {memory_before - memory_after:.1f}MB\n"
         f"• Current: {memory_after:.1f}MB",
-        parse_mode='Markdown'
+        parse_mode=ParseMode.HTML
     )
 
 async def memory_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1325,18 +2226,21 @@ async def memory_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     memory_mb = get_memory_usage()
     memory_percent = (memory_mb / MEMORY_LIMIT_MB) * 100
     
-    process = psutil.Process(os.getpid())
-    cpu_percent = process.cpu_percent(interval=1)
-    
     health = "🟢 Excellent" if memory_percent < 50 else "🟡 Good" if memory_percent < 70 else "🔴 Critical"
     
+    # Chrome runs in separate processes, measured rather than estimated per driver
+    browser_mb = await asyncio.get_running_loop().run_in_executor(executor, get_browser_memory_mb)
+    
     await update.message.reply_text(
-        f"💾 **MEMORY STATUS**\n"
+        f"💾 <b>MEMORY STATUS</b>\n"
         f"• RAM: {memory_mb:.1f}/{MEMORY_LIMIT_MB}MB\n"
+        f"• Chrome: {browser_mb:.1f}MB ({len(driver_pool)} pooled drivers)\n"
         f"• Usage: {memory_percent:.1f}%\n"
         f"• Health: {health}\n"
-        f"• CPU: {cpu_percent:.1f}%\n",
-        parse_mode='Markdown'
+        f"• CPU: {cpu_sample:.1f}%\n"
+        f"• Dropped notifications: {stats.get('notifications_dropped', 0)}\n"
+        f"• Page load timeouts: {stats.get('page_load_timeouts', 0)}\n",
+        parse_mode=ParseMode.HTML
     )
 
 async def toggle_mode(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1346,14 +2250,17 @@ async def toggle_mode(update: Update, context: ContextTypes.DEFAULT_TYPE):
     USE_SEQUENTIAL_MODE = not USE_SEQUENTIAL_MODE
     new_mode = "Sequential" if USE_SEQUENTIAL_MODE else "Parallel"
     
-    save_bot_state()
+    # Per-URL timings from the old mode don't carry over
+    reset_url_intervals()
+    
+    mark_state_dirty()
     
     await update.message.reply_text(
-        f"⚙️ **MODE CHANGED**\n"
-        f"New Mode: **{new_mode}**\n"
+        f"⚙️ <b>MODE CHANGED</b>\n"
+        f"New Mode: <b>{new_mode}</b>\n"
         f"Workers: {1 if USE_SEQUENTIAL_MODE else MAX_PARALLEL_CHECKS}\n"
-        f"{'⚠️ Restart monitoring for changes' if is_monitoring else '✅ Ready'}",
-        parse_mode='Markdown'
+        f"{'⚠️ Restart monitoring for changes' if monitor_state.running else '✅ Ready'}",
+        parse_mode=ParseMode.HTML
     )
 
 async def set_speed(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1362,17 +2269,17 @@ async def set_speed(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if not context.args:
         await update.message.reply_text(
-            "⚡ **SPEED SETTINGS**\n"
-            f"• Check Interval: {CHECK_INTERVAL}s\n"
+            "⚡ <b>SPEED SETTINGS</b>\n"
+            f"• Check Interval: {describe_interval()}\n"
             f"• Parallel Workers: {MAX_PARALLEL_CHECKS}\n"
             f"• React Wait: {REACT_WAIT_TIME}s\n"
             f"• Mode: {'Sequential' if USE_SEQUENTIAL_MODE else 'Parallel'}\n\n"
-            "**Usage:**\n"
-            "`/speed fast` - Fast settings (8 workers, 10s interval)\n"
-            "`/speed normal` - Normal settings (5 workers, 30s interval)\n"
-            "`/speed slow` - Slow/Stable (3 workers, 60s interval)\n"
-            "`/speed custom <interval> <workers>` - Custom settings",
-            parse_mode='Markdown'
+            "<b>Usage:</b>\n"
+            "<code>/speed fast</code> - Fast settings (8 workers, 10s interval)\n"
+            "<code>/speed normal</code> - Normal settings (5 workers, 30s interval)\n"
+            "<code>/speed slow</code> - Slow/Stable (3 workers, 60s interval)\n"
+            "<code>/speed custom &lt;interval&gt; &lt;workers&gt;</code> - Custom settings",
+            parse_mode=ParseMode.HTML
         )
         return
     
@@ -1381,18 +2288,18 @@ async def set_speed(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if preset == "fast":
         CHECK_INTERVAL = 10
         MAX_PARALLEL_CHECKS = 8
-        REACT_WAIT_TIME = 3
-        settings = "Fast (10s interval, 8 workers, 3s React wait)"
+        REACT_WAIT_TIME = 8
+        settings = "Fast (10s interval, 8 workers, 8s React wait)"
     elif preset == "normal":
         CHECK_INTERVAL = 30
         MAX_PARALLEL_CHECKS = 5
-        REACT_WAIT_TIME = 4
-        settings = "Normal (30s interval, 5 workers, 4s React wait)"
+        REACT_WAIT_TIME = 10
+        settings = "Normal (30s interval, 5 workers, 10s React wait)"
     elif preset == "slow":
         CHECK_INTERVAL = 60
         MAX_PARALLEL_CHECKS = 3
-        REACT_WAIT_TIME = 6
-        settings = "Slow/Stable (60s interval, 3 workers, 6s React wait)"
+        REACT_WAIT_TIME = 15
+        settings = "Slow/Stable (60s interval, 3 workers, 15s React wait)"
     elif preset == "custom" and len(context.args) >= 3:
         try:
             CHECK_INTERVAL = int(context.args[1])
@@ -1405,153 +2312,252 @@ async def set_speed(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Invalid preset. Use: fast, normal, slow, or custom")
         return
     
-    save_bot_state()
+    # Takes effect for the running monitor, no restart needed
+    await fetch_gate.resize(MAX_PARALLEL_CHECKS)
+    
+    # Restart adaptive back-off from the new base interval
+    reset_url_intervals()
+    
+    mark_state_dirty()
     
     await update.message.reply_text(
-        f"⚡ **SPEED UPDATED**\n"
-        f"Settings: **{settings}**\n\n"
-        f"**New Values:**\n"
-        f"• Check Interval: {CHECK_INTERVAL}s\n"
+        f"⚡ <b>SPEED UPDATED</b>\n"
+        f"Settings: <b>{settings}</b>\n\n"
+        f"<b>New Values:</b>\n"
+        f"• Check Interval: {describe_interval()}\n"
         f"• Parallel Workers: {MAX_PARALLEL_CHECKS}\n"
         f"• React Wait: {REACT_WAIT_TIME}s\n\n"
-        f"{'⚠️ Restart monitoring for changes to take effect' if is_monitoring else '✅ Ready to use new settings'}",
-        parse_mode='Markdown'
+        f"{'✅ Applied to running monitor' if monitor_state.running else '✅ Ready to use new settings'}",
+        parse_mode=ParseMode.HTML
     )
 
+def start_background_tasks(bot):
+    """Start the monitor and its background tasks (caller holds monitor_state.lock)"""
+    monitor_state.running = True
+    monitor_state.cycle = 0
+    drivers_stopping.clear()
+    monitor_state.tasks = {
+        'memory': asyncio.create_task(memory_monitor()),
+        'cache': asyncio.create_task(cache_sweeper()),
+        'notification': asyncio.create_task(notification_sender(bot)),
+        'monitor': asyncio.create_task(start_monitoring(bot))
+    }
+    for name, task in monitor_state.tasks.items():
+        task.add_done_callback(partial(forget_task, name))
+
+def forget_task(name: str, task: asyncio.Task):
+    """Drop a finished task from monitor_state so it doesn't pin its result or traceback"""
+    # A /stop + /run may already have replaced it under the same name
+    if monitor_state.tasks.get(name) is task:
+        del monitor_state.tasks[name]
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ Background task {name} died: {task.exception()}")
+
 async def run_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Run monitoring command"""
-    global is_monitoring
+    state = context.bot_data['monitor']
     
-    if is_monitoring:
-        await update.message.reply_text(
-            "⚠️ **Already Monitoring**",
-            parse_mode='Markdown'
-        )
-        return
-    
-    if not monitored_urls:
-        await update.message.reply_text(
-            "❌ **No URLs to Monitor**\n"
-            "Add URLs with `/add`",
-            parse_mode='Markdown'
-        )
-        return
-    
-    try:
-        is_monitoring = True
-        
-        # Start background tasks
-        memory_task = asyncio.create_task(memory_monitor())
-        notification_task = asyncio.create_task(notification_sender(context.application.bot))
-        monitor_task = asyncio.create_task(start_monitoring(context.application.bot))
-        
-        context.chat_data['tasks'] = {
-            'memory': memory_task,
-            'notification': notification_task,
-            'monitor': monitor_task
-        }
+    async with state.lock:
+        if state.running:
+            await update.message.reply_text(
+                "⚠️ <b>Already Monitoring</b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
         
-        await update.message.reply_text(
-            f"🚀 **MONITORING STARTED**\n"
-            f"• URLs: {len(monitored_urls)}\n"
-            f"• Mode: {'Sequential' if USE_SEQUENTIAL_MODE else 'Parallel'}\n"
-            f"• Interval: {CHECK_INTERVAL}s",
-            parse_mode='Markdown'
-        )
+        if not monitored_urls:
+            await update.message.reply_text(
+                "❌ <b>No URLs to Monitor</b>\n"
+                "Add URLs with <code>/add</code>",
+                parse_mode=ParseMode.HTML
+            )
+            return
         
-    except Exception as e:
-        is_monitoring = False
-        await update.message.reply_text(
-            f"❌ **Failed to Start**\n{str(e)[:100]}",
-            parse_mode='Markdown'
-        )
+        try:
+            start_background_tasks(context.application.bot)
+        except Exception as e:
+            state.running = False
+            await update.message.reply_text(
+                f"❌ <b>Failed to Start</b>\n{html.escape(str(e)[:100])}",
+                parse_mode=ParseMode.HTML
+            )
+            return
+    
+    await update.message.reply_text(
+        f"🚀 <b>MONITORING STARTED</b>\n"
+        f"• URLs: {len(monitored_urls)}\n"
+        f"• Mode: {'Sequential' if USE_SEQUENTIAL_MODE else 'Parallel'}\n"
+        f"• Interval: {describe_interval()}",
+        parse_mode=ParseMode.HTML
+    )
 
 async def stop_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Stop monitoring command"""
-    global is_monitoring
+    state = context.bot_data['monitor']
     
-    if not is_monitoring:
-        await update.message.reply_text(
-            "⚠️ **Not Monitoring**",
-            parse_mode='Markdown'
-        )
-        return
-    
-    is_monitoring = False
-    
-    # Cancel tasks
-    if 'tasks' in context.chat_data:
-        for task in context.chat_data['tasks'].values():
-            try:
-                task.cancel()
-            except:
-                pass
-        del context.chat_data['tasks']
-    
-    # Clear driver pool
-    with driver_pool_lock:
-        for driver in driver_pool:
-            try:
-                driver.quit()
-            except:
-                pass
-        driver_pool.clear()
-        driver_usage_count.clear()
+    # Held until teardown finishes so a concurrent /run can't overlap it
+    async with state.lock:
+        if not state.running:
+            await update.message.reply_text(
+                "⚠️ <b>Not Monitoring</b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        state.running = False
+        drivers_stopping.set()
+        
+        # Cancel tasks and wait for them to unwind before touching the drivers
+        tasks = list(state.tasks.values())
+        state.tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=TASK_CANCEL_TIMEOUT)
+            for task in pending:
+                print(f"⚠️ Task still running after {TASK_CANCEL_TIMEOUT}s: {task.get_name()}")
+            # Retrieve results so failed tasks don't keep their tracebacks (and frames) alive
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    print(f"⚠️ Task {task.get_name()} had failed: {task.exception()}")
+            del tasks, done, pending
+        
+        # Let Selenium checks already in a thread finish before their drivers are quit
+        if selenium_futures:
+            _, pending = await asyncio.wait(set(selenium_futures), timeout=TASK_CANCEL_TIMEOUT)
+            if pending:
+                print(f"⚠️ {len(pending)} Selenium checks still running after {TASK_CANCEL_TIMEOUT}s")
+        
+        # Clear driver pool
+        await quit_drivers(drain_driver_pool())
+        await asyncio.get_running_loop().run_in_executor(executor, reset_sequential_driver)
+        
+        # Break cycles left by the cancelled tasks' frames and exceptions
+        gc.collect()
     
-    save_bot_state()
+    await save_bot_state_async()
     
     await update.message.reply_text(
-        f"🛑 **MONITORING STOPPED**\n"
-        f"━━━━━━━━━━━━━━━━━━\n"
+        f"🛑 <b>MONITORING STOPPED</b>\n"
+        f"{BAR}\n"
         f"✅ State saved\n"
         f"✅ Resources cleaned",
-        parse_mode='Markdown'
+        parse_mode=ParseMode.HTML
     )
 
+COMMAND_HANDLERS = {
+    "start": start,
+    "help": help_command,
+    "add": add_url,
+    "remove": remove_url,
+    "list": list_urls,
+    "run": run_monitoring,
+    "stop": stop_monitoring,
+    "status": status,
+    "debug": debug_url,
+    "clear": clear_cache,
+    "memory": memory_status,
+    "mode": toggle_mode,
+    "speed": set_speed
+}
+
+async def dispatch_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Route a /command to its handler with one dict lookup"""
+    command, *args = update.effective_message.text.split()
+    name, _, target = command[1:].partition("@")
+    # In groups, /cmd@OtherBot is addressed to another bot
+    if target and target.lower() != (context.bot.username or "").lower():
+        return
+    handler = COMMAND_HANDLERS.get(name.lower())
+    if handler:
+        # Filled in by CommandHandler normally, the handlers read it
+        context.args = args
+        await handler(update, context)
+
 # ============================================================================
 # MAIN FUNCTIONS
 # ============================================================================
 
 async def auto_start_monitoring(application):
     """Auto-start after restart"""
-    global is_monitoring
-    
-    if len(monitored_urls) > 0 and not is_monitoring:
-        print(f"🔄 Auto-starting for {len(monitored_urls)} URLs")
+    async with monitor_state.lock:
+        if not monitored_urls or monitor_state.running:
+            return
+        
+        logger.info("🔄 Auto-starting for %d URLs", len(monitored_urls))
         
         try:
-            is_monitoring = True
+            start_background_tasks(application.bot)
             
-            memory_task = asyncio.create_task(memory_monitor())
-            notification_task = asyncio.create_task(notification_sender(application.bot))
-            monitor_task = asyncio.create_task(start_monitoring(application.bot))
-            
-            await notification_queue.put((
-                f"🔄 **AUTO-RESTART**\n"
+            enqueue_notification(
+                f"🔄 <b>AUTO-RESTART</b>\n"
                 f"Restored {len(monitored_urls)} URLs\n"
+                f"Mode: {'Sequential' if USE_SEQUENTIAL_MODE else 'Parallel'}\n"
+                f"Check Interval: {describe_interval()}\n"
                 f"Memory: {get_memory_usage():.1f}MB",
                 True
-            ))
+            )
             
         except Exception as e:
-            is_monitoring = False
-            print(f"❌ Auto-start failed: {e}")
+            monitor_state.running = False
+            logger.error("❌ Auto-start failed: %s", e)
+
+async def warm_pool_task(count: int):
+    """Warm the driver pool on the executor, reporting failures instead of losing them"""
+    try:
+        await asyncio.get_running_loop().run_in_executor(executor, warm_driver_pool, count)
+    except Exception as e:
+        logger.error("❌ Driver pool warm-up failed: %s", e)
+
+async def on_startup(application):
+    """Start app-lifetime tasks and schedule the auto-restart once the event loop is running"""
+    # fetch_gate was sized before load_bot_state restored /speed settings
+    await fetch_gate.resize(MAX_PARALLEL_CHECKS)
+    application.bot_data['app_tasks'] = [
+        asyncio.create_task(state_saver()),
+        asyncio.create_task(cpu_sampler())
+    ]
+    
+    # Only worth the memory when restored URLs are known to need Selenium
+    # and the pool is allowed to hold more than one idle driver
+    warmup = min(POOL_WARMUP_SIZE, sum(1 for url_data in monitored_urls.values() if url_data.needs_js))
+    update_memory_pressure(get_memory_usage())
+    if warmup and USE_DRIVER_POOL and not USE_SEQUENTIAL_MODE and effective_pool_size() > 1:
+        application.bot_data['app_tasks'].append(asyncio.create_task(warm_pool_task(warmup)))
+    if application.bot_data.get('auto_restart'):
+        async def delayed_start():
+            await asyncio.sleep(3)
+            await auto_start_monitoring(application)
+        application.create_task(delayed_start())
+
+async def on_shutdown(application):
+    """Release async resources while the event loop is still running"""
+    tasks = application.bot_data.pop('app_tasks', [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # run_polling handles SIGTERM itself, so this is the last point a normal
+    # stop or redeploy passes through - flush what state_saver hasn't written yet
+    if state_dirty:
+        await save_bot_state_async()
+    await close_http_session()
 
 def cleanup_on_exit():
     """Cleanup on exit"""
-    print("🧹 Cleaning up...")
+    logger.info("🧹 Cleaning up...")
     save_bot_state()
     
-    with driver_pool_lock:
-        for driver in driver_pool:
-            try:
-                driver.quit()
-            except:
-                pass
-        driver_pool.clear()
+    # No event loop here, quit in parallel and wait. Own threads, since the
+    # shared executor may still be tied up in page loads and has fewer workers
+    drivers = drain_driver_pool()
+    if drivers:
+        with ThreadPoolExecutor(max_workers=len(drivers)) as quitter:
+            list(quitter.map(safe_quit, drivers))
+    reset_sequential_driver()
     
     executor.shutdown(wait=False)
-    print("✅ Cleanup complete")
+    logger.info("✅ Cleanup complete")
 
 def main():
     """Main function"""
@@ -1562,11 +2568,19 @@ def main():
         
         should_auto_restart = load_bot_state()
         
+        # Move startup objects (modules, config, restored state) to the
+        # permanent generation so full collections skip them
+        gc.freeze()
+        gc.set_threshold(*GC_THRESHOLDS)
+        
         print(f"📊 Memory: {get_memory_usage():.1f}MB")
         print(f"📊 URLs: {len(monitored_urls)}")
         
         if sys.platform == "win32":
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        elif uvloop is not None:
+            uvloop.install()
+            print("⚡ Using uvloop event loop")
         
         print("🔧 Creating Telegram app...")
         application = (
@@ -1577,41 +2591,28 @@ def main():
             .write_timeout(20)
             .connect_timeout(20)
             .pool_timeout(20)
+            .http_version(TELEGRAM_HTTP_VERSION)
+            .get_updates_http_version(TELEGRAM_HTTP_VERSION)
+            .post_init(on_startup)
+            .post_shutdown(on_shutdown)
             .build()
         )
         
-        print("✅ App created")
+        print(f"✅ App created (HTTP/{TELEGRAM_HTTP_VERSION})")
+        
+        application.bot_data['monitor'] = monitor_state
+        application.bot_data['auto_restart'] = should_auto_restart
         
         # Add handlers
         application.add_handler(MessageHandler(filters.ALL, auth_middleware), group=-1)
         
-        handlers = [
-            CommandHandler("start", start),
-            CommandHandler("help", help_command),
-            CommandHandler("add", add_url),
-            CommandHandler("remove", remove_url),
-            CommandHandler("list", list_urls),
-            CommandHandler("run", run_monitoring),
-            CommandHandler("stop", stop_monitoring),
-            CommandHandler("status", status),
-            CommandHandler("debug", debug_url),
-            CommandHandler("clear", clear_cache),
-            CommandHandler("memory", memory_status),
-            CommandHandler("mode", toggle_mode),
-            CommandHandler("speed", set_speed)
-        ]
-        
-        for handler in handlers:
-            application.add_handler(handler)
+        # One handler for every command instead of a filter chain per command
+        application.add_handler(MessageHandler(filters.COMMAND, dispatch_command))
         
         print("✅ Handlers ready")
         
         if should_auto_restart:
             print("⏳ Auto-restart scheduled...")
-            async def delayed_start():
-                await asyncio.sleep(3)
-                await auto_start_monitoring(application)
-            asyncio.create_task(delayed_start())
         
         print("🚀 Bot starting...")
         print(f"📡 Chat ID: {CHAT_ID}")
@@ -1629,8 +2630,7 @@ def main():
         print("\n🛑 Shutdown")
         cleanup_on_exit()
     except Exception as e:
-        print(f"❌ ERROR: {e}")
-        print(traceback.format_exc())
+        logger.exception("❌ ERROR: %s", e)
         cleanup_on_exit()
     finally:
         print("👋 Goodbye!")